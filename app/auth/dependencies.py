@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from datetime import datetime
 from uuid import UUID
 from fastapi import Depends, HTTPException, status
@@ -7,6 +8,14 @@ from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
+@dataclass(frozen=True, slots=True)
+class CurrentUser:
+    """The authenticated user as described by the signed access token claims."""
+    id: UUID
+    username: str
+    is_active: bool
+    is_verified: bool
+
 def get_current_user(
     token: str = Depends(oauth2_scheme)
 ) -> UserResponse:
@@ -79,3 +88,32 @@ def get_current_active_user(
             detail="Inactive user"
         )
     return current_user
+
+def get_current_user_light(
+    token: str = Depends(oauth2_scheme)
+) -> CurrentUser:
+    """
+    Dependency for read-only endpoints that trusts the signed token claims.
+
+    No user row is loaded; tokens issued before the status claims were
+    added are treated as active, matching get_current_user.
+    """
+    claims = User.verify_token_claims(token)
+    if claims is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    current_user = CurrentUser(
+        id=claims["sub"],
+        username=claims.get("username", "unknown"),
+        is_active=claims.get("is_active", True),
+        is_verified=claims.get("is_verified", False),
+    )
+    if not current_user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Inactive user"
+        )
+    return current_user
@@ -1,11 +1,18 @@
 # app/auth/jwt.py
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional, Union
-from jose import jwt, JWTError, ExpiredSignatureError
+import jwt
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
 from uuid import UUID
-import secrets
+from calendar import timegm
+import base64
+import hashlib
+import hmac
+import os
+import ssl
+import time
+import orjson
 
 from app.core.config import get_settings
 from app.auth.redis import add_to_blacklist, is_blacklisted
@@ -17,16 +24,162 @@ from app.models.user import User
 
 settings = get_settings()
 
+# Signing keys are process-global; encode them once instead of on every call
+_SECRET_KEY = settings.SECRET_KEY.encode()
+_TOKEN_KEYS = {
+    TokenType.ACCESS: settings.JWT_SECRET_KEY.encode(),
+    TokenType.REFRESH: settings.JWT_REFRESH_SECRET_KEY.encode(),
+}
+
+# HMAC state with each key already absorbed; signing copies it instead of
+# re-deriving the inner/outer pads from the key on every token
+_HMAC_STATES = {
+    key: hmac.new(key, digestmod=hashlib.sha256)
+    for key in (_SECRET_KEY, *_TOKEN_KEYS.values())
+}
+
+def _hmac_sha256(key: bytes, msg: bytes) -> bytes:
+    state = _HMAC_STATES.get(key)
+    if state is None:
+        return hmac.new(key, msg, hashlib.sha256).digest()
+    mac = state.copy()
+    mac.update(msg)
+    return mac.digest()
+
+# Default lifetimes, built once rather than per token; the access lifetime
+# is public so token responses compute expires_at from the same value
+ACCESS_TOKEN_DELTA = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+_REFRESH_DELTA = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+_TOKEN_DELTAS = {TokenType.ACCESS: ACCESS_TOKEN_DELTA, TokenType.REFRESH: _REFRESH_DELTA}
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+# With HS256 the header segment never changes, so it is encoded once here
+_FAST_HS256 = settings.ALGORITHM == "HS256"
+_HEADER_B64 = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+_TIME_CLAIMS = ("exp", "iat", "nbf")
+
+def _fast_encode(claims: dict, key: bytes) -> str:
+    """
+    Encode an HS256 JWT without PyJWT's per-call dispatch.
+    
+    Produces the same token as jwt.encode: datetime time claims become
+    integer timestamps, then one JSON dump, one HMAC and base64url.
+    Non-ASCII text is written as UTF-8 instead of \\u escapes, which
+    decodes to the same claims. Mutates claims, so pass a dict the
+    caller owns.
+    """
+    for claim in _TIME_CLAIMS:
+        value = claims.get(claim)
+        if isinstance(value, datetime):
+            claims[claim] = timegm(value.utctimetuple())
+    signing_input = _HEADER_B64 + b"." + _b64url(orjson.dumps(claims))
+    signature = _hmac_sha256(key, signing_input)
+    return (signing_input + b"." + _b64url(signature)).decode("ascii")
+
+def _encode(claims: dict, key: bytes) -> str:
+    if _FAST_HS256:
+        return _fast_encode(claims, key)
+    return jwt.encode(claims, key, algorithm=settings.ALGORITHM)
+
+def _b64url_decode(data: bytes) -> bytes:
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+def _fast_decode(
+    token: str, key: bytes, verify_exp: bool = True, require: tuple[str, ...] = ()
+) -> dict:
+    """
+    Verify and decode a token carrying the pre-encoded HS256 header.
+    
+    Tokens with any other header go through PyJWT. Failures raise the
+    same PyJWT exception types, so callers handle both paths alike.
+    """
+    try:
+        signing_input, _, signature = token.encode("ascii").rpartition(b".")
+    except UnicodeEncodeError:
+        raise jwt.DecodeError("Invalid token encoding")
+    header, _, payload_b64 = signing_input.partition(b".")
+    if header != _HEADER_B64:
+        return jwt.decode(
+            token, key, algorithms=[settings.ALGORITHM],
+            options={"verify_exp": verify_exp, "require": list(require)}
+        )
+
+    expected = _b64url(_hmac_sha256(key, signing_input))
+    if not hmac.compare_digest(expected, signature):
+        raise jwt.InvalidSignatureError("Signature verification failed")
+    try:
+        payload = orjson.loads(_b64url_decode(payload_b64))
+    except ValueError:
+        raise jwt.DecodeError("Invalid payload padding or JSON")
+    if not isinstance(payload, dict):
+        raise jwt.DecodeError("Invalid payload string: must be a json object")
+
+    for claim in require:
+        if claim not in payload:
+            raise jwt.MissingRequiredClaimError(claim)
+
+    now = time.time()
+    for claim in _TIME_CLAIMS:
+        if claim in payload and not isinstance(payload[claim], (int, float)):
+            raise jwt.DecodeError(f"The {claim} claim must be a number")
+    if verify_exp and "exp" in payload and payload["exp"] <= now:
+        raise jwt.ExpiredSignatureError("Signature has expired")
+    # PyJWT compares iat as an integer and rejects tokens issued in the future
+    if "iat" in payload and int(payload["iat"]) > now:
+        raise jwt.ImmatureSignatureError("The token is not yet valid (iat)")
+    if "nbf" in payload and payload["nbf"] > now:
+        raise jwt.ImmatureSignatureError("The token is not yet valid (nbf)")
+    return payload
+
+def decode_jwt(
+    token: str, key: bytes, verify_exp: bool = True, require: tuple[str, ...] = ()
+) -> dict:
+    """
+    Verify a token signed with key and return its claims.
+    
+    Signature, expiry and the presence of every claim in require are all
+    checked in this one decode. Raises PyJWT's InvalidTokenError subclasses
+    on failure.
+    """
+    if _FAST_HS256:
+        return _fast_decode(token, key, verify_exp, require)
+    return jwt.decode(
+        token, key, algorithms=[settings.ALGORITHM],
+        options={"verify_exp": verify_exp, "require": list(require)}
+    )
+
+def decode_access_claims(token: str) -> dict:
+    """
+    Verify an access token from create_token and return its claims.
+    
+    Uses the pre-encoded access-token key. Raises PyJWT's InvalidTokenError
+    subclasses on failure, leaving the HTTP response to the caller.
+    """
+    return decode_jwt(token, _TOKEN_KEYS[TokenType.ACCESS])
+
 # Re-export for backward compatibility
 get_password_hash = hash_password
 __all__ = [
     'hash_password', 'verify_password', 'get_password_hash', 
-    'create_token', 'decode_token', 'oauth2_scheme',
+    'create_token', 'decode_token', 'decode_jwt', 'decode_access_claims', 'oauth2_scheme',
     'create_access_token', 'decode_access_token'  # Simple helpers
 ]
 
+def describe_hmac_backend() -> str:
+    """
+    Report which SHA-256 implementation signs HS256 tokens.
+    
+    hashlib delegates to OpenSSL when available, which selects SHA-NI or
+    other accelerated code paths at runtime; the builtin fallback is several
+    times slower per signature.
+    """
+    backend = "OpenSSL" if hashlib.sha256.__name__.startswith("openssl_") else "builtin"
+    return f"JWT HMAC-SHA256 backend: {backend} ({ssl.OPENSSL_VERSION})"
+
 # ============================================================================
 # Simple JWT Helpers (Simplified API)
 # ============================================================================
@@ -48,26 +201,23 @@ def create_access_token(data: dict, expires_minutes: Optional[int] = None) -> st
         >>> token = create_access_token({"sub": "user123", "email": "user@example.com"})
     """
     to_encode = data.copy()
+    now = datetime.now(timezone.utc)
     
     if expires_minutes:
-        expire = datetime.now(timezone.utc) + timedelta(minutes=expires_minutes)
+        expire = now + timedelta(minutes=expires_minutes)
     else:
-        expire = datetime.now(timezone.utc) + timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-        )
+        expire = now + ACCESS_TOKEN_DELTA
     
     to_encode.update({
         "exp": expire,
-        "iat": datetime.now(timezone.utc)
+        "iat": now
     })
     
-    encoded_jwt = jwt.encode(
-        to_encode, 
-        settings.SECRET_KEY,  # Use the simple SECRET_KEY
-        algorithm=settings.ALGORITHM
-    )
-    return encoded_jwt
+    return _encode(to_encode, _SECRET_KEY)  # Use the simple SECRET_KEY
+
 
+# Claims every access token must carry; checked during the verified decode
+_ACCESS_REQUIRED_CLAIMS = ("exp", "iat", "sub")
 
 def decode_access_token(token: str) -> dict:
     """
@@ -87,20 +237,20 @@ def decode_access_token(token: str) -> dict:
         >>> user_id = payload["sub"]
     """
     try:
-        payload = jwt.decode(
+        payload = decode_jwt(
             token,
-            settings.SECRET_KEY,  # Use the simple SECRET_KEY
-            algorithms=[settings.ALGORITHM]
+            _SECRET_KEY,  # Use the simple SECRET_KEY
+            require=_ACCESS_REQUIRED_CLAIMS
         )
         return payload
         
-    except ExpiredSignatureError:
+    except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has expired",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    except JWTError as e:
+    except jwt.InvalidTokenError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Could not validate token: {str(e)}",
@@ -114,42 +264,35 @@ def decode_access_token(token: str) -> dict:
 def create_token(
     user_id: Union[str, UUID],
     token_type: TokenType,
-    expires_delta: Optional[timedelta] = None
+    expires_delta: Optional[timedelta] = None,
+    claims: Optional[dict[str, Any]] = None
 ) -> str:
     """
     Create a JWT token (access or refresh).
+    
+    Extra claims are signed into the token alongside the registered ones,
+    which always take precedence.
     """
+    now = datetime.now(timezone.utc)
     if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
+        expire = now + expires_delta
     else:
-        if token_type == TokenType.ACCESS:
-            expire = datetime.now(timezone.utc) + timedelta(
-                minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
-            )
-        else:
-            expire = datetime.now(timezone.utc) + timedelta(
-                days=settings.REFRESH_TOKEN_EXPIRE_DAYS
-            )
+        expire = now + _TOKEN_DELTAS[token_type]
 
     if isinstance(user_id, UUID):
         user_id = str(user_id)
 
-    to_encode = {
+    to_encode = dict(claims) if claims else {}
+    to_encode.update({
         "sub": user_id,
         "type": token_type.value,
         "exp": expire,
-        "iat": datetime.now(timezone.utc),
-        "jti": secrets.token_hex(16)
-    }
-
-    secret = (
-        settings.JWT_SECRET_KEY 
-        if token_type == TokenType.ACCESS 
-        else settings.JWT_REFRESH_SECRET_KEY
-    )
+        "iat": now,
+        "jti": os.urandom(16).hex()
+    })
 
     try:
-        return jwt.encode(to_encode, secret, algorithm=settings.ALGORITHM)
+        return _encode(to_encode, _TOKEN_KEYS[token_type])
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -165,18 +308,7 @@ async def decode_token(
     Decode and verify a JWT token.
     """
     try:
-        secret = (
-            settings.JWT_SECRET_KEY 
-            if token_type == TokenType.ACCESS 
-            else settings.JWT_REFRESH_SECRET_KEY
-        )
-        
-        payload = jwt.decode(
-            token,
-            secret,
-            algorithms=[settings.ALGORITHM],
-            options={"verify_exp": verify_exp}
-        )
+        payload = decode_jwt(token, _TOKEN_KEYS[token_type], verify_exp)
         
         if payload.get("type") != token_type.value:
             raise HTTPException(
@@ -194,13 +326,13 @@ async def decode_token(
             
         return payload
         
-    except ExpiredSignatureError:
+    except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token has expired",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    except JWTError:
+    except jwt.InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -219,7 +351,8 @@ async def get_current_user(
         payload = await decode_token(token, TokenType.ACCESS)
         user_id = payload["sub"]
         
-        user = db.query(User).filter(User.id == user_id).first()
+        # Primary-key lookup goes through the session's identity map first
+        user = db.get(User, UUID(user_id))
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1,14 +1,21 @@
 # app/auth/redis.py
-import aioredis
+import redis.asyncio as aioredis
 from app.core.config import get_settings
 
 settings = get_settings()
 
+# One pool per process; clients borrow connections from it instead of
+# opening their own
+_pool = aioredis.ConnectionPool.from_url(
+    settings.REDIS_URL or "redis://localhost",
+    max_connections=50,
+    socket_keepalive=True,
+    health_check_interval=30,
+)
+
 async def get_redis():
     if not hasattr(get_redis, "redis"):
-        get_redis.redis = await aioredis.from_url(
-            settings.REDIS_URL or "redis://localhost"
-        )
+        get_redis.redis = aioredis.Redis(connection_pool=_pool)
     return get_redis.redis
 
 async def add_to_blacklist(jti: str, exp: int):
@@ -19,4 +26,4 @@ async def add_to_blacklist(jti: str, exp: int):
 async def is_blacklisted(jti: str) -> bool:
     """Check if a token's JTI is blacklisted"""
     redis = await get_redis()
-    return await redis.exists(f"blacklist:{jti}")
\ No newline at end of file
+    return bool(await redis.exists(f"blacklist:{jti}"))
@@ -2,30 +2,26 @@
 """
 Authentication security utilities for password hashing and verification.
 
-This module provides secure password hashing using bcrypt through passlib.
+This module provides secure password hashing using the bcrypt library.
 All password operations in the application should use these utilities.
 """
 
-from passlib.context import CryptContext
+import bcrypt
 from app.core.config import get_settings
 
 settings = get_settings()
 
-# Configure password hashing context
-# Using bcrypt with configurable rounds for security/performance balance
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto",
-    bcrypt__rounds=settings.BCRYPT_ROUNDS
-)
+# bcrypt is the only scheme in use, so call the library directly instead of
+# going through a multi-scheme context on every hash/verify
+_BCRYPT_IDENT = "2b"
 
 
 def hash_password(plain: str) -> str:
     """
     Hash a plain-text password using bcrypt.
     
-    This function uses the passlib CryptContext with bcrypt hashing.
-    The number of bcrypt rounds is configurable via settings.BCRYPT_ROUNDS.
+    A fresh salt is generated for every call. The number of bcrypt rounds
+    is configurable via settings.BCRYPT_ROUNDS.
     
     Args:
         plain: The plain-text password to hash
@@ -38,7 +34,8 @@ def hash_password(plain: str) -> str:
         >>> print(hashed[:7])
         $2b$12$
     """
-    return pwd_context.hash(plain)
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+    return bcrypt.hashpw(plain.encode("utf-8"), salt).decode("ascii")
 
 
 def verify_password(plain: str, hashed: str) -> bool:
@@ -62,7 +59,7 @@ def verify_password(plain: str, hashed: str) -> bool:
         >>> verify_password("WrongPassword", hashed)
         False
     """
-    return pwd_context.verify(plain, hashed)
+    return bcrypt.checkpw(plain.encode("utf-8"), hashed.encode("ascii"))
 
 
 def needs_rehash(hashed: str) -> bool:
@@ -78,9 +75,17 @@ def needs_rehash(hashed: str) -> bool:
     Returns:
         bool: True if the hash should be updated, False otherwise
         
+    Raises:
+        ValueError: If the value is not a bcrypt hash
+        
     Example:
         >>> if verify_password(plain, hashed) and needs_rehash(hashed):
         >>>     new_hash = hash_password(plain)
         >>>     # Update database with new_hash
     """
-    return pwd_context.needs_update(hashed)
+    # bcrypt hashes look like $2b$12$<salt+checksum>
+    parts = hashed.split("$")
+    if len(parts) != 4 or not parts[2].isdigit():
+        raise ValueError("hash could not be identified as bcrypt")
+    return parts[1] != _BCRYPT_IDENT or int(parts[2]) != settings.BCRYPT_ROUNDS
+
@@ -21,6 +21,9 @@ class Settings(BaseSettings):
     BCRYPT_ROUNDS: int = 12
     CORS_ORIGINS: List[str] = ["*"]
     
+    # Deployment environment; "production" skips create_all at startup
+    ENV: str = "development"
+    
     # Redis (optional, for token blacklisting)
     REDIS_URL: Optional[str] = "redis://localhost:6379/0"
     
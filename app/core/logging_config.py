@@ -0,0 +1,37 @@
+# app/core/logging_config.py
+import logging
+import queue
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+
+
+@contextmanager
+def queued_logging(level: int = logging.INFO):
+    """
+    Route application logging through a queue for the duration of the block.
+
+    Request handlers only enqueue records; a background listener thread
+    formats them and writes to stderr. Only the app package is raised to
+    level, so libraries keep their own. Remaining records are flushed, the
+    handler removed and the previous level restored on exit.
+    """
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+    queue_handler = QueueHandler(log_queue)
+
+    root = logging.getLogger()
+    app_logger = logging.getLogger("app")
+    previous_level = app_logger.level
+    app_logger.setLevel(level)
+    root.addHandler(queue_handler)
+    listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+    try:
+        yield
+    finally:
+        root.removeHandler(queue_handler)
+        app_logger.setLevel(previous_level)
+        listener.stop()
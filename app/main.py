@@ -1,35 +1,48 @@
+import logging
 from contextlib import asynccontextmanager
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 from uuid import UUID
 from typing import List
 
-from fastapi import FastAPI, Depends, HTTPException, status, Request
+from fastapi import FastAPI, Depends, HTTPException, Query, status, Request
 from fastapi.security import OAuth2PasswordRequestForm
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+import orjson
 import uvicorn
 
-from app.auth.dependencies import get_current_active_user
+from app.auth.dependencies import get_current_active_user, get_current_user_light
+from app.auth.jwt import ACCESS_TOKEN_DELTA, describe_hmac_backend
 from app.core.config import get_settings
+from app.core.logging_config import queued_logging
 from app.models.calculation import Calculation
 from app.models.user import User
-from app.schemas.calculation import CalculationBase, CalculationResponse, CalculationUpdate
+from app.schemas.calculation import (
+    CALCULATION_LIST_ADAPTER, CalculationBase, CalculationResponse, CalculationUpdate
+)
+from app.schemas.auth import INVALID_CREDENTIALS, INVALID_USERNAME_OR_PASSWORD
 from app.schemas.token import TokenResponse
 from app.schemas.user import UserCreate, UserLogin
 from app.database import Base, get_db, engine
 
 
-# Create tables on startup
+logger = logging.getLogger(__name__)
+
+# Create tables on startup (outside production, where the schema is managed separately)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("Creating tables...")
-    Base.metadata.create_all(bind=engine)
-    print("Tables created successfully!")
-    yield
+    with queued_logging():
+        if get_settings().ENV != "production":
+            logger.info("Creating tables...")
+            Base.metadata.create_all(bind=engine)
+            logger.info("Tables created successfully!")
+        logger.info(describe_hmac_backend())
+        yield
 
 app = FastAPI(
     title="Calculations API",
@@ -80,6 +93,11 @@ def dashboard_page(request: Request):
 def read_health():
     return {"status": "ok"}
 
+@app.get("/healthz", tags=["health"], include_in_schema=False)
+async def read_healthz():
+    """Bodyless liveness probe for test harnesses polling server startup."""
+    return Response(status_code=status.HTTP_200_OK)
+
 # ------------------------------------------------------------------------------
 # User Registration Endpoint
 # ------------------------------------------------------------------------------
@@ -124,42 +142,24 @@ def register(user_create: UserCreate, db: Session = Depends(get_db)):
     
     Returns a JWT access token and refresh token upon successful registration.
     """
+    # Exclude confirm_password before passing data to User.register
+    user_data = user_create.model_dump(exclude={"confirm_password"})
     try:
-        # Check for duplicate email specifically (before attempting registration)
-        existing_email = db.query(User).filter(User.email == user_create.email).first()
-        if existing_email:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already exists"
-            )
-        
-        # Check for duplicate username
-        existing_username = db.query(User).filter(User.username == user_create.username).first()
-        if existing_username:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Username already exists"
-            )
-        
-        # Exclude confirm_password before passing data to User.register
-        user_data = user_create.dict(exclude={"confirm_password"})
-        
-        # Register the user (this will hash the password and create the user)
+        # Register the user (this will hash the password and create the user).
+        # User.register checks email and username in a single query.
         user = User.register(db, user_data)
         
-        # Commit the transaction
-        db.commit()
-        db.refresh(user)
+        # Flush so duplicates surface now; the id and defaults are set
+        # client-side, so no refresh round-trip is needed
+        db.flush()
         
         # Generate JWT tokens for the newly registered user
-        access_token = User.create_access_token({"sub": str(user.id)})
+        access_token = User.create_access_token(user.access_token_claims())
         refresh_token = User.create_refresh_token({"sub": str(user.id)})
-        expires_at = datetime.now(timezone.utc) + timedelta(
-            minutes=get_settings().ACCESS_TOKEN_EXPIRE_MINUTES
-        )
+        expires_at = datetime.now(timezone.utc) + ACCESS_TOKEN_DELTA
         
-        # Return token response
-        return TokenResponse(
+        # Build the response before committing, which would expire the user's attributes
+        response = TokenResponse(
             access_token=access_token,
             refresh_token=refresh_token,
             token_type="bearer",
@@ -172,6 +172,8 @@ def register(user_create: UserCreate, db: Session = Depends(get_db)):
             is_active=user.is_active,
             is_verified=user.is_verified
         )
+        db.commit()
+        return response
         
     except HTTPException:
         # Re-raise HTTP exceptions (duplicate email/username)
@@ -186,11 +188,25 @@ def register(user_create: UserCreate, db: Session = Depends(get_db)):
             detail=str(e)
         )
     
-    except Exception as e:
+    except IntegrityError:
+        # A concurrent registration won the race past the duplicate check;
+        # re-run it against the committed row to report which field clashed
+        db.rollback()
+        try:
+            User.check_registration(db, user_data)
+            detail = "Username or email already exists"
+        except ValueError as e:
+            detail = str(e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail
+        )
+    
+    except Exception:
         # Handle any unexpected database or system errors
         db.rollback()
         # Log the actual error for debugging (don't expose to client)
-        print(f"Registration error: {str(e)}")
+        logger.exception("Registration error")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred during registration. Please try again later."
@@ -234,46 +250,48 @@ def login_json(user_login: UserLogin, db: Session = Depends(get_db)):
         if auth_result is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid credentials",
+                detail=INVALID_CREDENTIALS.detail,
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        # Commit the last_login update
         user = auth_result["user"]
-        db.commit()
 
         # Ensure expires_at is timezone-aware
         expires_at = auth_result.get("expires_at")
         if expires_at and expires_at.tzinfo is None:
             expires_at = expires_at.replace(tzinfo=timezone.utc)
         else:
-            expires_at = datetime.now(timezone.utc) + timedelta(
-                minutes=get_settings().ACCESS_TOKEN_EXPIRE_MINUTES
-            )
+            expires_at = datetime.now(timezone.utc) + ACCESS_TOKEN_DELTA
 
-        return TokenResponse(
-            access_token=auth_result["access_token"],
-            refresh_token=auth_result["refresh_token"],
-            token_type="bearer",
-            expires_at=expires_at,
-            user_id=user.id,
-            username=user.username,
-            email=user.email,
-            first_name=user.first_name,
-            last_name=user.last_name,
-            is_active=user.is_active,
-            is_verified=user.is_verified
-        )
+        # Serialized straight to JSON bytes: the fields come from the freshly
+        # authenticated row, so TokenResponse validation adds nothing here
+        body = orjson.dumps({
+            "access_token": auth_result["access_token"],
+            "refresh_token": auth_result["refresh_token"],
+            "token_type": "bearer",
+            "expires_at": expires_at,
+            "user_id": user.id,
+            "username": user.username,
+            "email": user.email,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "is_active": user.is_active,
+            "is_verified": user.is_verified
+        }, option=orjson.OPT_UTC_Z)
+
+        # Commit the last_login update once the response no longer needs the row
+        db.commit()
+        return Response(body, media_type="application/json")
     
     except HTTPException:
         # Re-raise HTTP exceptions (401 Unauthorized)
         db.rollback()
         raise
     
-    except Exception as e:
+    except Exception:
         # Handle any unexpected errors
         db.rollback()
-        print(f"Login error: {str(e)}")
+        logger.exception("Login error")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred during login. Please try again later."
@@ -286,7 +304,7 @@ def login_form(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = D
     if auth_result is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid username or password",
+            detail=INVALID_USERNAME_OR_PASSWORD.detail,
             headers={"WWW-Authenticate": "Bearer"},
         )
 
@@ -325,11 +343,13 @@ def create_calculation(
         )
         new_calculation.result = new_calculation.get_result()
 
-        # Persist the calculation to the database.
+        # Persist the calculation to the database. The id and timestamps are
+        # filled in client-side at flush, so the response is built without a refresh.
         db.add(new_calculation)
+        db.flush()
+        response = CalculationResponse.model_validate(new_calculation)
         db.commit()
-        db.refresh(new_calculation)
-        return new_calculation
+        return response
 
     except ValueError as e:
         db.rollback()
@@ -341,25 +361,52 @@ def create_calculation(
 # Browse / List Calculations (for the current user)
 @app.get("/calculations", response_model=List[CalculationResponse], tags=["calculations"])
 def list_calculations(
-    current_user = Depends(get_current_active_user),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    current_user = Depends(get_current_user_light),
     db: Session = Depends(get_db)
 ):
-    calculations = db.query(Calculation).filter(Calculation.user_id == current_user.id).all()
-    return calculations
+    # Newest first, one page at a time so large histories aren't loaded whole
+    calculations = (
+        db.query(Calculation)
+        .filter(Calculation.user_id == current_user.id)
+        .order_by(Calculation.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    # Validate and serialize the list in one pass instead of per item through response_model
+    items = CALCULATION_LIST_ADAPTER.validate_python(calculations, from_attributes=True)
+    return Response(CALCULATION_LIST_ADAPTER.dump_json(items), media_type="application/json")
+
+# Upper bound on ids per batch request, which keeps the IN (...) list small
+MAX_BATCH_IDS = 100
+
+# Read several Calculations by ID in one query
+# (declared before /calculations/{calc_id} so "batch" is not taken as an id)
+@app.get("/calculations/batch", response_model=List[CalculationResponse], tags=["calculations"])
+def get_calculations_batch(
+    ids: List[UUID] = Query(..., max_length=MAX_BATCH_IDS),
+    current_user = Depends(get_current_user_light),
+    db: Session = Depends(get_db)
+):
+    # ids arrive as repeated ?ids= params; FastAPI rejects malformed or too many with 422
+    calculations = db.query(Calculation).filter(
+        Calculation.id.in_(ids),
+        Calculation.user_id == current_user.id
+    ).all()
+    # Return in the requested order; ids that are missing or not owned are skipped
+    by_id = {calculation.id: calculation for calculation in calculations}
+    return [by_id[calc_id] for calc_id in dict.fromkeys(ids) if calc_id in by_id]
 
-# Read / Retrieve a Specific Calculation by ID
 @app.get("/calculations/{calc_id}", response_model=CalculationResponse, tags=["calculations"])
 def get_calculation(
-    calc_id: str,
-    current_user = Depends(get_current_active_user),
+    calc_id: UUID,
+    current_user = Depends(get_current_user_light),
     db: Session = Depends(get_db)
 ):
-    try:
-        calc_uuid = UUID(calc_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid calculation id format.")
     calculation = db.query(Calculation).filter(
-        Calculation.id == calc_uuid,
+        Calculation.id == calc_id,
         Calculation.user_id == current_user.id
     ).first()
     if not calculation:
@@ -369,17 +416,13 @@ def get_calculation(
 # Edit / Update a Calculation
 @app.put("/calculations/{calc_id}", response_model=CalculationResponse, tags=["calculations"])
 def update_calculation(
-    calc_id: str,
+    calc_id: UUID,
     calculation_update: CalculationUpdate,
     current_user = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    try:
-        calc_uuid = UUID(calc_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid calculation id format.")
     calculation = db.query(Calculation).filter(
-        Calculation.id == calc_uuid,
+        Calculation.id == calc_id,
         Calculation.user_id == current_user.id
     ).first()
     if not calculation:
@@ -388,24 +431,22 @@ def update_calculation(
     if calculation_update.inputs is not None:
         calculation.inputs = calculation_update.inputs
         calculation.result = calculation.get_result()
-    calculation.updated_at = datetime.utcnow()
+    # The column is a naive DateTime holding UTC, like its utcnow defaults
+    calculation.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    db.flush()
+    response = CalculationResponse.model_validate(calculation)
     db.commit()
-    db.refresh(calculation)
-    return calculation
+    return response
 
 # Delete a Calculation
 @app.delete("/calculations/{calc_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["calculations"])
 def delete_calculation(
-    calc_id: str,
+    calc_id: UUID,
     current_user = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    try:
-        calc_uuid = UUID(calc_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid calculation id format.")
     calculation = db.query(Calculation).filter(
-        Calculation.id == calc_uuid,
+        Calculation.id == calc_id,
         Calculation.user_id == current_user.id
     ).first()
     if not calculation:
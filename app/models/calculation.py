@@ -1,5 +1,8 @@
 # app/models/calculation.py
 from datetime import datetime
+from functools import reduce
+import math
+import operator
 import uuid
 from typing import List
 from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Float
@@ -105,57 +108,41 @@ class Calculation(Base, AbstractCalculation):
         #"with_polymorphic": "*"
     }
 
+def _validated_inputs(inputs) -> list:
+    """Shared input checks for every calculation type."""
+    if not isinstance(inputs, list):
+        raise ValueError("Inputs must be a list of numbers.")
+    if len(inputs) < 2:
+        raise ValueError("Inputs must be a list with at least two numbers.")
+    return inputs
+
 class Addition(Calculation):
     """Addition calculation"""
     __mapper_args__ = {"polymorphic_identity": "addition"}
 
     def get_result(self) -> float:
-        if not isinstance(self.inputs, list):
-            raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
-            raise ValueError("Inputs must be a list with at least two numbers.")
-        return sum(self.inputs)
+        return sum(_validated_inputs(self.inputs))
 
 class Subtraction(Calculation):
     """Subtraction calculation"""
     __mapper_args__ = {"polymorphic_identity": "subtraction"}
 
     def get_result(self) -> float:
-        if not isinstance(self.inputs, list):
-            raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
-            raise ValueError("Inputs must be a list with at least two numbers.")
-        result = self.inputs[0]
-        for value in self.inputs[1:]:
-            result -= value
-        return result
+        return reduce(operator.sub, _validated_inputs(self.inputs))
 
 class Multiplication(Calculation):
     """Multiplication calculation"""
     __mapper_args__ = {"polymorphic_identity": "multiplication"}
 
     def get_result(self) -> float:
-        if not isinstance(self.inputs, list):
-            raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
-            raise ValueError("Inputs must be a list with at least two numbers.")
-        result = 1
-        for value in self.inputs:
-            result *= value
-        return result
+        return math.prod(_validated_inputs(self.inputs))
 
 class Division(Calculation):
     """Division calculation"""
     __mapper_args__ = {"polymorphic_identity": "division"}
 
     def get_result(self) -> float:
-        if not isinstance(self.inputs, list):
-            raise ValueError("Inputs must be a list of numbers.")
-        if len(self.inputs) < 2:
-            raise ValueError("Inputs must be a list with at least two numbers.")
-        result = self.inputs[0]
-        for value in self.inputs[1:]:
-            if value == 0:
-                raise ValueError("Cannot divide by zero.")
-            result /= value
-        return result
+        inputs = _validated_inputs(self.inputs)
+        if 0 in inputs[1:]:
+            raise ValueError("Cannot divide by zero.")
+        return reduce(operator.truediv, inputs)
@@ -1,16 +1,13 @@
 # app/models/user.py
 
 import uuid
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 from sqlalchemy import Column, String, Boolean, DateTime, or_
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship
-from app.core.config import get_settings
 from app.database import Base
 from app.models.calculation import Calculation
 
-settings = get_settings()
-
 def utcnow():
     """Helper function to get current UTC datetime"""
     return datetime.now(timezone.utc)
@@ -52,6 +49,19 @@ class User(Base):
         """String representation of the user."""
         return f"<User(name={self.first_name} {self.last_name}, email={self.email})>"
 
+    def access_token_claims(self) -> dict:
+        """
+        Claims signed into this user's access tokens.
+        
+        Read-only endpoints trust these instead of loading the user row.
+        """
+        return {
+            "sub": str(self.id),
+            "username": self.username,
+            "is_active": self.is_active,
+            "is_verified": self.is_verified,
+        }
+
     def update(self, **kwargs):
         """
         Update user attributes and ensure updated_at is refreshed.
@@ -100,17 +110,14 @@ class User(Base):
         return hash_password(password)
 
     @classmethod
-    def register(cls, db, user_data: dict):
+    def check_registration(cls, db, user_data: dict) -> None:
         """
-        Register a new user.
-
+        Validate registration data against the password rules and existing users.
+        
         Args:
             db: SQLAlchemy database session
             user_data: Dictionary containing user registration data
             
-        Returns:
-            User: The newly created user instance
-            
         Raises:
             ValueError: If password is invalid or username/email already exists
         """
@@ -118,8 +125,7 @@ class User(Base):
         if not password or len(password) < 8:
             raise ValueError("Password must be at least 8 characters long")
         
-        # Check for duplicate email or username (fallback check)
-        # Note: The endpoint should check this first for better error messages
+        # Check for duplicate email or username in one query
         existing_user = db.query(cls).filter(
             or_(cls.email == user_data["email"], cls.username == user_data["username"])
         ).first()
@@ -128,12 +134,30 @@ class User(Base):
                 raise ValueError("Email already exists")
             else:
                 raise ValueError("Username already exists")
+
+    @classmethod
+    def register(cls, db, user_data: dict):
+        """
+        Register a new user.
+
+        Args:
+            db: SQLAlchemy database session
+            user_data: Dictionary containing user registration data
+            
+        Returns:
+            User: The newly created user instance
+            
+        Raises:
+            ValueError: If password is invalid or username/email already exists
+        """
+        cls.check_registration(db, user_data)
         
         # Hash the password
-        hashed_password = cls.hash_password(password)
+        hashed_password = cls.hash_password(user_data["password"])
         
         # Create new user instance
         user = cls(
+            id=uuid.uuid4(),  # Known before the INSERT, so callers need no refresh
             first_name=user_data["first_name"],
             last_name=user_data["last_name"],
             email=user_data["email"],
@@ -160,6 +184,7 @@ class User(Base):
         Returns:
             dict: Authentication result with tokens and user data, or None if authentication fails
         """
+        from app.auth.jwt import ACCESS_TOKEN_DELTA
         user = db.query(cls).filter(
             or_(cls.username == username_or_email, cls.email == username_or_email)
         ).first()
@@ -172,9 +197,9 @@ class User(Base):
         db.flush()
 
         # Generate tokens
-        access_token = cls.create_access_token({"sub": str(user.id)})
+        access_token = cls.create_access_token(user.access_token_claims())
         refresh_token = cls.create_refresh_token({"sub": str(user.id)})
-        expires_at = utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expires_at = utcnow() + ACCESS_TOKEN_DELTA
 
         return {
             "access_token": access_token,
@@ -190,14 +215,15 @@ class User(Base):
         Create a JWT access token.
         
         Args:
-            data: Token payload data
+            data: Token payload data; keys other than "sub" become extra claims
             
         Returns:
             str: JWT access token
         """
         from app.auth.jwt import create_token
         from app.schemas.token import TokenType
-        return create_token(data["sub"], TokenType.ACCESS)
+        claims = {k: v for k, v in data.items() if k != "sub"}
+        return create_token(data["sub"], TokenType.ACCESS, claims=claims)
 
     @classmethod
     def create_refresh_token(cls, data: dict) -> str:
@@ -214,6 +240,29 @@ class User(Base):
         from app.schemas.token import TokenType
         return create_token(data["sub"], TokenType.REFRESH)
 
+    @classmethod
+    def verify_token_claims(cls, token: str):
+        """
+        Verify a JWT access token and return its claims.
+        
+        Args:
+            token: JWT token to verify
+            
+        Returns:
+            dict: Token claims with "sub" parsed to a UUID, None if invalid
+        """
+        import jwt
+        from app.auth.jwt import decode_access_claims
+        try:
+            payload = decode_access_claims(token)
+        except jwt.InvalidTokenError:
+            return None
+        try:
+            payload["sub"] = uuid.UUID(payload["sub"])
+        except (KeyError, ValueError, TypeError, AttributeError):
+            return None
+        return payload
+
     @classmethod
     def verify_token(cls, token: str):
         """
@@ -225,16 +274,5 @@ class User(Base):
         Returns:
             UUID: User ID if token is valid, None otherwise
         """
-        from app.core.config import settings
-        from jose import jwt, JWTError
-        try:
-            payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.ALGORITHM])
-            sub = payload.get("sub")
-            if sub is None:
-                return None
-            try:
-                return uuid.UUID(sub)
-            except (ValueError, TypeError):
-                return None
-        except JWTError:
-            return None
\ No newline at end of file
+        payload = cls.verify_token_claims(token)
+        return payload["sub"] if payload else None
\ No newline at end of file
@@ -14,7 +14,9 @@ from .auth import (
     UserRegister,
     UserLogin as AuthUserLogin,
     TokenResponse as AuthTokenResponse,
-    ErrorResponse
+    ErrorResponse,
+    INVALID_CREDENTIALS,
+    INVALID_USERNAME_OR_PASSWORD
 )
 
 from .calculation import (
@@ -22,7 +24,8 @@ from .calculation import (
     CalculationBase,
     CalculationCreate,
     CalculationUpdate,
-    CalculationResponse
+    CalculationResponse,
+    CALCULATION_LIST_ADAPTER
 )
 
 __all__ = [
@@ -40,10 +43,13 @@ __all__ = [
     'AuthUserLogin',
     'AuthTokenResponse',
     'ErrorResponse',
+    'INVALID_CREDENTIALS',
+    'INVALID_USERNAME_OR_PASSWORD',
     # Calculation schemas
     'CalculationType',
     'CalculationBase',
     'CalculationCreate',
     'CalculationUpdate',
     'CalculationResponse',
+    'CALCULATION_LIST_ADAPTER',
 ]
\ No newline at end of file
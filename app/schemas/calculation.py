@@ -1,5 +1,5 @@
 from enum import Enum
-from pydantic import BaseModel, Field, ConfigDict, model_validator, field_validator
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter, model_validator, field_validator
 from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
@@ -134,3 +134,6 @@ class CalculationResponse(CalculationBase):
             }
         }
     )
+
+# Built once: validates and serializes a whole result list in one pydantic-core call
+CALCULATION_LIST_ADAPTER = TypeAdapter(List[CalculationResponse])
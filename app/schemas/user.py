@@ -1,10 +1,13 @@
 # app/schemas/user.py
 
-from typing import Optional
+from typing import Annotated, Optional
 from uuid import UUID
 from datetime import datetime
 from pydantic import BaseModel, EmailStr, Field, ConfigDict, model_validator
 
+# Length bounds shared by every password-like field
+Password = Annotated[str, Field(min_length=8, max_length=128)]
+
 class UserBase(BaseModel):
     """Base user schema with common fields"""
     first_name: str = Field(
@@ -34,25 +37,29 @@ class UserBase(BaseModel):
 
 class UserCreate(UserBase):
     """Schema for user creation with password validation"""
-    password: str = Field(
-        min_length=8,
-        max_length=128,
+    password: Password = Field(
         example="SecurePass123!",
         description="User's password (8-128 characters)"
     )
-    confirm_password: str = Field(
-        min_length=8,
-        max_length=128,
+    confirm_password: Password = Field(
         example="SecurePass123!",
         description="Password confirmation"
     )
 
-    @model_validator(mode='after')
-    def verify_password_match(self) -> "UserCreate":
-        """Verify that password and confirm_password match"""
-        if self.password != self.confirm_password:
-            raise ValueError("Passwords do not match")
-        return self
+    @model_validator(mode='before')
+    @classmethod
+    def verify_password_match(cls, data):
+        """
+        Verify that password and confirm_password match on the raw input.
+        
+        Only two strings are compared; a missing or mistyped field is left to
+        field validation so it reports its own error.
+        """
+        if isinstance(data, dict):
+            password, confirm = data.get('password'), data.get('confirm_password')
+            if isinstance(password, str) and isinstance(confirm, str) and password != confirm:
+                raise ValueError("Passwords do not match")
+        return data
 
     @model_validator(mode='after')
     def validate_password_strength(self) -> "UserCreate":
@@ -71,6 +78,8 @@ class UserCreate(UserBase):
         return self
 
     model_config = ConfigDict(
+        frozen=True,
+        extra='ignore',
         json_schema_extra={
             "example": {
                 "first_name": "John",
@@ -155,24 +164,18 @@ class UserUpdate(BaseModel):
 
 class PasswordUpdate(BaseModel):
     """Schema for password updates"""
-    current_password: str = Field(
+    current_password: Password = Field(
         ...,
-        min_length=8,
-        max_length=128,
         example="OldPass123!",
         description="Current password"
     )
-    new_password: str = Field(
+    new_password: Password = Field(
         ...,
-        min_length=8,
-        max_length=128,
         example="NewPass123!",
         description="New password"
     )
-    confirm_new_password: str = Field(
+    confirm_new_password: Password = Field(
         ...,
-        min_length=8,
-        max_length=128,
         example="NewPass123!",
         description="Confirm new password"
     )
@@ -12,6 +12,11 @@ from app.auth.jwt import create_access_token, decode_access_token
 from fastapi import HTTPException
 import time
 
+if __name__ == "__main__":
+    # Block-buffer the many prints below; Python flushes stdout once at exit.
+    # Only when run directly, so importing this file leaves stdout alone.
+    sys.stdout.reconfigure(line_buffering=False)
+
 print("=" * 70)
 print("JWT Helper Functions Demo")
 print("=" * 70)
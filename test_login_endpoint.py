@@ -4,11 +4,25 @@ Test script for POST /login endpoint
 Demonstrates login scenarios and token usage
 """
 
+import sys
+import time
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
 
 BASE_URL = "http://localhost:8000"
 
+# One keep-alive session for every request so the tests reuse connections
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+
+# Fixed part of the registration payload; only email/username vary per run
+_REG_TEMPLATE = {
+    "first_name": "Login",
+    "last_name": "Test",
+    "password": "TestPass123!",
+    "confirm_password": "TestPass123!"
+}
+
 def print_section(title):
     print("\n" + "=" * 70)
     print(f"  {title}")
@@ -18,22 +32,13 @@ def register_test_user():
     """Helper: Register a test user for login tests"""
     print_section("Setup: Register Test User")
     
-    timestamp = int(datetime.now().timestamp())
-    email = f"logintest_{timestamp}@example.com"
-    username = f"logintest_{timestamp}"
-    password = "TestPass123!"
+    ts = time.time_ns()
+    payload = _REG_TEMPLATE.copy()
+    payload["email"] = email = f"logintest_{ts}@example.com"
+    payload["username"] = username = f"logintest_{ts}"
+    password = payload["password"]
     
-    response = requests.post(
-        f"{BASE_URL}/auth/register",
-        json={
-            "email": email,
-            "username": username,
-            "first_name": "Login",
-            "last_name": "Test",
-            "password": password,
-            "confirm_password": password
-        }
-    )
+    response = SESSION.post(f"{BASE_URL}/auth/register", json=payload)
     
     if response.status_code == 201:
         print(f"✅ Test user registered")
@@ -49,7 +54,7 @@ def test_login_with_email(credentials):
     """Test 1: Login with email address"""
     print_section("Test 1: Login with Email")
     
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/auth/login",
         json={
             "username": credentials["email"],  # Field is 'username' but accepts email
@@ -78,7 +83,7 @@ def test_login_with_username(credentials):
     """Test 2: Login with username"""
     print_section("Test 2: Login with Username")
     
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/auth/login",
         json={
             "username": credentials["username"],
@@ -101,7 +106,7 @@ def test_invalid_email():
     """Test 3: Invalid email returns 401 'Invalid credentials'"""
     print_section("Test 3: Invalid Email")
     
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/auth/login",
         json={
             "username": "nonexistent@example.com",
@@ -124,7 +129,7 @@ def test_wrong_password(credentials):
     """Test 4: Valid email but wrong password returns 401"""
     print_section("Test 4: Valid Email, Wrong Password")
     
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/auth/login",
         json={
             "username": credentials["email"],
@@ -147,7 +152,7 @@ def test_empty_password(credentials):
     """Test 5: Empty password returns 401"""
     print_section("Test 5: Empty Password")
     
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/auth/login",
         json={
             "username": credentials["email"],
@@ -169,7 +174,7 @@ def test_case_sensitivity(credentials):
     
     # Try with uppercase email
     email_upper = credentials["email"].upper()
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/auth/login",
         json={
             "username": email_upper,
@@ -198,7 +203,7 @@ def test_token_validity(token):
     
     # Decode token (without verification for inspection)
     import base64
-    import json
+    import orjson
     
     try:
         # Split token into parts
@@ -207,14 +212,10 @@ def test_token_validity(token):
             print("❌ Invalid JWT format - should have 3 parts")
             return
         
-        # Decode payload (add padding if needed)
+        # Decode payload, restoring the base64 padding JWTs strip
         payload_b64 = parts[1]
-        padding = 4 - len(payload_b64) % 4
-        if padding != 4:
-            payload_b64 += '=' * padding
-        
-        payload_json = base64.urlsafe_b64decode(payload_b64)
-        payload = json.loads(payload_json)
+        payload_json = base64.urlsafe_b64decode(payload_b64 + '=' * (-len(payload_b64) % 4))
+        payload = orjson.loads(payload_json)
         
         print("✅ Token decoded successfully")
         print(f"   Subject (user_id): {payload.get('sub')}")
@@ -245,7 +246,7 @@ def test_use_token_for_api(token):
     headers = {"Authorization": f"Bearer {token}"}
     
     # Try to access calculations endpoint (likely requires auth)
-    response = requests.get(f"{BASE_URL}/calculations", headers=headers)
+    response = SESSION.get(f"{BASE_URL}/calculations", headers=headers)
     
     print(f"Request: GET /calculations")
     print(f"Status Code: {response.status_code}")
@@ -266,7 +267,7 @@ def test_missing_fields():
     """Test 9: Missing required fields returns 422"""
     print_section("Test 9: Missing Required Fields")
     
-    response = requests.post(
+    response = SESSION.post(
         f"{BASE_URL}/auth/login",
         json={
             "username": "test@example.com"
@@ -286,6 +287,9 @@ def test_missing_fields():
         print(f"Response: {response.json()}")
 
 if __name__ == "__main__":
+    # Block-buffer the many prints below; Python flushes stdout once at exit
+    sys.stdout.reconfigure(line_buffering=False)
+    
     print("\n" + "█" * 70)
     print("█" + " " * 68 + "█")
     print("█" + "  POST /login Endpoint Tests".center(68) + "█")
@@ -297,7 +301,7 @@ if __name__ == "__main__":
     
     try:
         # Test if server is running
-        response = requests.get(f"{BASE_URL}/health", timeout=2)
+        response = SESSION.get(f"{BASE_URL}/health", timeout=2)
         if response.status_code != 200:
             print("\n❌ Server not responding correctly!")
             exit(1)
@@ -4,33 +4,56 @@ Test script for POST /register endpoint
 Demonstrates all test cases and error scenarios
 """
 
-import requests
-import json
-from datetime import datetime
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+import httpx
+import orjson
 
 BASE_URL = "http://localhost:8000"
 
+# Unique suffix source for emails/usernames; safe across the concurrent tests
+_uid = itertools.count(int(time.time() * 1000))
+
+def uid():
+    return next(_uid)
+
+# Keep-alive pool shared by the tests; sized for the concurrent validation batch
+LIMITS = httpx.Limits(max_connections=8, max_keepalive_connections=8)
+
+# Fields every registration shares; make_user() adds a fresh email/username
+BASE = MappingProxyType({
+    "first_name": "Test",
+    "last_name": "User",
+    "password": "SecurePass123!",
+    "confirm_password": "SecurePass123!"
+})
+
+def make_user(**overrides):
+    """Valid registration body with a fresh email/username, plus any overrides."""
+    u = uid()
+    return {
+        **BASE,
+        "email": overrides.pop("email", f"test_{u}@example.com"),
+        "username": overrides.pop("username", f"testuser_{u}"),
+        **overrides
+    }
+
 def print_section(title):
     print("\n" + "=" * 70)
     print(f"  {title}")
     print("=" * 70)
 
-def test_valid_registration():
+async def test_valid_registration(client):
     """Test 1: Valid registration returns 201 with JWT token"""
-    print_section("Test 1: Valid Registration")
-    
-    response = requests.post(
-        f"{BASE_URL}/auth/register",
-        json={
-            "email": f"test_{datetime.now().timestamp()}@example.com",
-            "username": f"testuser_{int(datetime.now().timestamp())}",
-            "first_name": "Test",
-            "last_name": "User",
-            "password": "SecurePass123!",
-            "confirm_password": "SecurePass123!"
-        }
+    response = await client.post(
+        "/auth/register",
+        content=orjson.dumps(make_user())
     )
     
+    print_section("Test 1: Valid Registration")
     print(f"Status Code: {response.status_code}")
     if response.status_code == 201:
         data = response.json()
@@ -49,37 +72,32 @@ def test_valid_registration():
         print(f"❌ FAILED: {response.json()}")
         return None
 
-def test_duplicate_email():
+# Access tokens from successful registrations, so any test needing an
+# authenticated user reuses one instead of registering again
+_TOKEN_CACHE = {}
+
+async def get_valid_token(client):
+    """Return a token for a registered user, registering one on first use."""
+    if "default" not in _TOKEN_CACHE:
+        _TOKEN_CACHE["default"] = await test_valid_registration(client)
+    return _TOKEN_CACHE["default"]
+
+async def test_duplicate_email(client):
     """Test 2: Duplicate email returns 400"""
-    print_section("Test 2: Duplicate Email")
-    
     # First registration
-    email = f"duplicate_{datetime.now().timestamp()}@example.com"
-    requests.post(
-        f"{BASE_URL}/auth/register",
-        json={
-            "email": email,
-            "username": f"user1_{int(datetime.now().timestamp())}",
-            "first_name": "User",
-            "last_name": "One",
-            "password": "SecurePass123!",
-            "confirm_password": "SecurePass123!"
-        }
+    email = f"duplicate_{uid()}@example.com"
+    await client.post(
+        "/auth/register",
+        content=orjson.dumps(make_user(email=email, first_name="User", last_name="One"))
     )
     
     # Try duplicate email with different username
-    response = requests.post(
-        f"{BASE_URL}/auth/register",
-        json={
-            "email": email,  # Same email
-            "username": f"user2_{int(datetime.now().timestamp())}",  # Different username
-            "first_name": "User",
-            "last_name": "Two",
-            "password": "SecurePass123!",
-            "confirm_password": "SecurePass123!"
-        }
+    response = await client.post(
+        "/auth/register",
+        content=orjson.dumps(make_user(email=email, first_name="User", last_name="Two"))
     )
     
+    print_section("Test 2: Duplicate Email")
     print(f"Status Code: {response.status_code}")
     if response.status_code == 400:
         error = response.json()
@@ -87,37 +105,22 @@ def test_duplicate_email():
     else:
         print(f"❌ FAILED: Expected 400, got {response.status_code}")
 
-def test_duplicate_username():
+async def test_duplicate_username(client):
     """Test 3: Duplicate username returns 400"""
-    print_section("Test 3: Duplicate Username")
-    
     # First registration
-    username = f"duplicateuser_{int(datetime.now().timestamp())}"
-    requests.post(
-        f"{BASE_URL}/auth/register",
-        json={
-            "email": f"user1_{datetime.now().timestamp()}@example.com",
-            "username": username,
-            "first_name": "User",
-            "last_name": "One",
-            "password": "SecurePass123!",
-            "confirm_password": "SecurePass123!"
-        }
+    username = f"duplicateuser_{uid()}"
+    await client.post(
+        "/auth/register",
+        content=orjson.dumps(make_user(username=username, first_name="User", last_name="One"))
     )
     
     # Try duplicate username with different email
-    response = requests.post(
-        f"{BASE_URL}/auth/register",
-        json={
-            "email": f"user2_{datetime.now().timestamp()}@example.com",
-            "username": username,  # Same username
-            "first_name": "User",
-            "last_name": "Two",
-            "password": "SecurePass123!",
-            "confirm_password": "SecurePass123!"
-        }
+    response = await client.post(
+        "/auth/register",
+        content=orjson.dumps(make_user(username=username, first_name="User", last_name="Two"))
     )
     
+    print_section("Test 3: Duplicate Username")
     print(f"Status Code: {response.status_code}")
     if response.status_code == 400:
         error = response.json()
@@ -125,151 +128,47 @@ def test_duplicate_username():
     else:
         print(f"❌ FAILED: Expected 400, got {response.status_code}")
 
-def test_weak_password_no_uppercase():
-    """Test 4: Weak password (no uppercase) returns 400"""
-    print_section("Test 4: Weak Password - No Uppercase")
-    
-    response = requests.post(
-        f"{BASE_URL}/auth/register",
-        json={
-            "email": f"test_{datetime.now().timestamp()}@example.com",
-            "username": f"testuser_{int(datetime.now().timestamp())}",
-            "first_name": "Test",
-            "last_name": "User",
-            "password": "weakpass123!",  # No uppercase
-            "confirm_password": "weakpass123!"
-        }
-    )
-    
-    print(f"Status Code: {response.status_code}")
-    if response.status_code in [400, 422]:
-        error = response.json()
-        print(f"✅ Correctly rejected: {error.get('detail', error)}")
-    else:
-        print(f"❌ FAILED: Expected 400/422, got {response.status_code}")
-
-def test_weak_password_no_digit():
-    """Test 5: Weak password (no digit) returns 400"""
-    print_section("Test 5: Weak Password - No Digit")
-    
-    response = requests.post(
-        f"{BASE_URL}/auth/register",
-        json={
-            "email": f"test_{datetime.now().timestamp()}@example.com",
-            "username": f"testuser_{int(datetime.now().timestamp())}",
-            "first_name": "Test",
-            "last_name": "User",
-            "password": "WeakPassword!",  # No digit
-            "confirm_password": "WeakPassword!"
-        }
-    )
-    
-    print(f"Status Code: {response.status_code}")
-    if response.status_code in [400, 422]:
-        error = response.json()
-        print(f"✅ Correctly rejected: {error.get('detail', error)}")
-    else:
-        print(f"❌ FAILED: Expected 400/422, got {response.status_code}")
+@dataclass(frozen=True)
+class Case:
+    """One registration payload that the server must reject."""
+    title: str
+    patch: dict
+    expected: frozenset
+    drop: tuple = ()
 
-def test_password_too_short():
-    """Test 6: Password too short returns 400"""
-    print_section("Test 6: Password Too Short")
-    
-    response = requests.post(
-        f"{BASE_URL}/auth/register",
-        json={
-            "email": f"test_{datetime.now().timestamp()}@example.com",
-            "username": f"testuser_{int(datetime.now().timestamp())}",
-            "first_name": "Test",
-            "last_name": "User",
-            "password": "Short1!",  # Only 7 chars
-            "confirm_password": "Short1!"
-        }
-    )
-    
-    print(f"Status Code: {response.status_code}")
-    if response.status_code in [400, 422]:
-        error = response.json()
-        print(f"✅ Correctly rejected: {error.get('detail', error)}")
-    else:
-        print(f"❌ FAILED: Expected 400/422, got {response.status_code}")
+# Tests 4-9: independent validation failures, each a patch on the valid payload
+CASES = [
+    Case("Test 4: Weak Password - No Uppercase",
+         {"password": "weakpass123!", "confirm_password": "weakpass123!"}, frozenset({400, 422})),
+    Case("Test 5: Weak Password - No Digit",
+         {"password": "WeakPassword!", "confirm_password": "WeakPassword!"}, frozenset({400, 422})),
+    Case("Test 6: Password Too Short",
+         {"password": "Short1!", "confirm_password": "Short1!"}, frozenset({400, 422})),
+    Case("Test 7: Password Mismatch",
+         {"confirm_password": "DifferentPass123!"}, frozenset({400, 422})),
+    Case("Test 8: Invalid Email Format",
+         {"email": "not-a-valid-email"}, frozenset({422})),
+    Case("Test 9: Missing Required Field",
+         {}, frozenset({422}), drop=("username",)),
+]
 
-def test_password_mismatch():
-    """Test 7: Password mismatch returns 400"""
-    print_section("Test 7: Password Mismatch")
-    
-    response = requests.post(
-        f"{BASE_URL}/auth/register",
-        json={
-            "email": f"test_{datetime.now().timestamp()}@example.com",
-            "username": f"testuser_{int(datetime.now().timestamp())}",
-            "first_name": "Test",
-            "last_name": "User",
-            "password": "SecurePass123!",
-            "confirm_password": "DifferentPass123!"  # Mismatch
-        }
-    )
-    
+async def run_case(client, case):
+    """Post one validation case and report whether it was rejected as expected."""
+    body = make_user(**case.patch)
+    for field in case.drop:
+        del body[field]
+    response = await client.post("/auth/register", content=orjson.dumps(body))
+    
+    print_section(case.title)
     print(f"Status Code: {response.status_code}")
-    if response.status_code in [400, 422]:
+    if response.status_code in case.expected:
         error = response.json()
         print(f"✅ Correctly rejected: {error.get('detail', error)}")
     else:
-        print(f"❌ FAILED: Expected 400/422, got {response.status_code}")
-
-def test_invalid_email():
-    """Test 8: Invalid email format returns 422"""
-    print_section("Test 8: Invalid Email Format")
-    
-    response = requests.post(
-        f"{BASE_URL}/auth/register",
-        json={
-            "email": "not-a-valid-email",  # Invalid format
-            "username": f"testuser_{int(datetime.now().timestamp())}",
-            "first_name": "Test",
-            "last_name": "User",
-            "password": "SecurePass123!",
-            "confirm_password": "SecurePass123!"
-        }
-    )
-    
-    print(f"Status Code: {response.status_code}")
-    if response.status_code == 422:
-        error = response.json()
-        print(f"✅ Correctly rejected with validation error")
-        if 'detail' in error and isinstance(error['detail'], list):
-            for err in error['detail']:
-                print(f"   - {err.get('msg', err)}")
-    else:
-        print(f"❌ FAILED: Expected 422, got {response.status_code}")
+        expected = "/".join(str(code) for code in sorted(case.expected))
+        print(f"❌ FAILED: Expected {expected}, got {response.status_code}")
 
-def test_missing_required_field():
-    """Test 9: Missing required field returns 422"""
-    print_section("Test 9: Missing Required Field")
-    
-    response = requests.post(
-        f"{BASE_URL}/auth/register",
-        json={
-            "email": f"test_{datetime.now().timestamp()}@example.com",
-            # Missing username
-            "first_name": "Test",
-            "last_name": "User",
-            "password": "SecurePass123!",
-            "confirm_password": "SecurePass123!"
-        }
-    )
-    
-    print(f"Status Code: {response.status_code}")
-    if response.status_code == 422:
-        error = response.json()
-        print(f"✅ Correctly rejected with validation error")
-        if 'detail' in error and isinstance(error['detail'], list):
-            for err in error['detail']:
-                print(f"   - Field: {err.get('loc', 'N/A')}, {err.get('msg', err)}")
-    else:
-        print(f"❌ FAILED: Expected 422, got {response.status_code}")
-
-def test_use_token(token):
+async def test_use_token(client, token):
     """Test 10: Use JWT token to access protected endpoint"""
     if not token:
         print("\n⚠️  Skipping token test - no valid token available")
@@ -279,7 +178,7 @@ def test_use_token(token):
     
     # Try to access a protected endpoint with the token
     headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(f"{BASE_URL}/profile", headers=headers)
+    response = await client.get("/profile", headers=headers)
     
     print(f"Status Code: {response.status_code}")
     if response.status_code == 200:
@@ -291,6 +190,39 @@ def test_use_token(token):
         print(f"Status: {response.status_code}")
         print(f"Response: {response.json()}")
 
+async def main():
+    # Bodies are pre-serialized with orjson, so the JSON content type is set once here
+    async with httpx.AsyncClient(
+        base_url=BASE_URL,
+        limits=LIMITS,
+        headers={"Content-Type": "application/json"}
+    ) as client:
+        # Test if server is running, backing off briefly in case it is still starting
+        for attempt in range(5):
+            try:
+                response = await client.get("/health", timeout=0.5)
+                break
+            except httpx.TransportError:
+                await asyncio.sleep(0.1 * 2 ** attempt)
+        else:
+            print(f"\n❌ Cannot connect to {BASE_URL}")
+            print("   Make sure the server is running!")
+            exit(1)
+        if response.status_code != 200:
+            print("\n❌ Server not responding correctly!")
+            exit(1)
+        
+        # Tests 1-3 depend on each other's registrations, so they run in order
+        await get_valid_token(client)
+        await test_duplicate_email(client)
+        await test_duplicate_username(client)
+        
+        # The validation failures are independent; run them concurrently.
+        # Each case prints its report only after its response arrives, so
+        # the sections don't interleave.
+        await asyncio.gather(*(run_case(client, case) for case in CASES))
+        await test_use_token(client, await get_valid_token(client))
+
 if __name__ == "__main__":
     print("\n" + "█" * 70)
     print("█" + " " * 68 + "█")
@@ -301,28 +233,7 @@ if __name__ == "__main__":
     print("\n⚠️  Make sure the server is running: uvicorn app.main:app --reload")
     print("⚠️  Run this from the project root directory")
     
-    try:
-        # Test if server is running
-        response = requests.get(f"{BASE_URL}/health", timeout=2)
-        if response.status_code != 200:
-            print("\n❌ Server not responding correctly!")
-            exit(1)
-    except requests.exceptions.ConnectionError:
-        print(f"\n❌ Cannot connect to {BASE_URL}")
-        print("   Make sure the server is running!")
-        exit(1)
-    
-    # Run all tests
-    token = test_valid_registration()
-    test_duplicate_email()
-    test_duplicate_username()
-    test_weak_password_no_uppercase()
-    test_weak_password_no_digit()
-    test_password_too_short()
-    test_password_mismatch()
-    test_invalid_email()
-    test_missing_required_field()
-    test_use_token(token)
+    asyncio.run(main())
     
     print("\n" + "=" * 70)
     print("✅ All tests completed!")
@@ -50,12 +50,12 @@ def test_password_hashing():
     # Test 5: Multiple hashes are different (salt)
     print("🎲 Salt Uniqueness Test")
     print("=" * 60)
-    hash1 = hash_password(plain_password)
+    # One more hash is enough; compare it against the one from Test 1
     hash2 = hash_password(plain_password)
-    print(f"Hash 1: {hash1[:30]}...")
+    print(f"Hash 1: {hashed[:30]}...")
     print(f"Hash 2: {hash2[:30]}...")
-    print(f"Are hashes different? {hash1 != hash2}")
-    assert hash1 != hash2, "Each hash should have a unique salt"
+    print(f"Are hashes different? {hashed != hash2}")
+    assert hashed != hash2, "Each hash should have a unique salt"
     print("✅ PASSED: Each hash uses a unique salt")
     print()
     
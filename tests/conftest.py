@@ -1,3 +1,4 @@
+import os
 import socket
 import subprocess
 import time
@@ -12,6 +13,11 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 from playwright.sync_api import sync_playwright, Browser, Page
 
+# bcrypt's minimum work factor for the suite (and the server it starts): every
+# registration and login still hashes for real, at 1/256th of the default cost.
+# Must be set before app.core.config builds its settings.
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
 from app.database import Base, get_engine, get_sessionmaker
 from app.models.user import User
 from app.core.config import settings
@@ -29,8 +35,11 @@ logger = logging.getLogger(__name__)
 # ======================================================================================
 # Database Configuration
 # ======================================================================================
+# pytest-xdist worker index (0 outside xdist); offsets ports and seeds per worker
+WORKER_INDEX = int(os.environ.get("PYTEST_XDIST_WORKER", "gw0")[2:])
+
 fake = Faker()
-Faker.seed(12345)
+Faker.seed(12345 + WORKER_INDEX)
 
 test_engine = get_engine(database_url=settings.DATABASE_URL)
 TestingSessionLocal = get_sessionmaker(engine=test_engine)
@@ -67,31 +76,26 @@ def managed_db_session():
 def wait_for_server(url: str, timeout: int = 30) -> bool:
     """
     Wait for the server to be ready by repeatedly issuing GET requests until
-    we receive a 200 status code or hit the timeout.
+    we receive a 200 status code or hit the timeout. Probes back off from
+    0.1s up to 1s and share one keep-alive session.
     """
-    start_time = time.time()
-    while (time.time() - start_time) < timeout:
-        try:
-            response = requests.get(url)
-            if response.status_code == 200:
-                return True
-        except requests.exceptions.ConnectionError:
-            time.sleep(1)
+    deadline = time.time() + timeout
+    delay = 0.1
+    with requests.Session() as session:
+        while time.time() < deadline:
+            try:
+                if session.get(url, timeout=0.5).status_code == 200:
+                    return True
+            except requests.exceptions.RequestException:
+                pass
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
     return False
 
-class ServerStartupError(Exception):
-    """Raised when the test server fails to start properly."""
-    pass
-
 # ======================================================================================
 # Database Fixtures
 # ======================================================================================
-@pytest.fixture(scope="session", autouse=True)
-def setup_test_database(request):
-    """
-    Set up the test database before the session starts, and tear it down after tests
-    unless --preserve-db is provided.
-    """
+def _reset_database():
     logger.info("Setting up test database...")
     try:
         Base.metadata.drop_all(bind=test_engine)
@@ -102,6 +106,34 @@ def setup_test_database(request):
         logger.error(f"Error setting up test database: {str(e)}")
         raise
 
+def _is_xdist_controller(config) -> bool:
+    """True in the pytest-xdist process that spawns workers but runs no tests itself."""
+    return bool(getattr(config.option, "numprocesses", None)) and not hasattr(config, "workerinput")
+
+def pytest_sessionstart(session):
+    """Under xdist, reset the shared database once, before any worker starts."""
+    if _is_xdist_controller(session.config):
+        _reset_database()
+
+def pytest_sessionfinish(session, exitstatus):
+    """Under xdist, drop the shared database once every worker has finished."""
+    if _is_xdist_controller(session.config) and not session.config.getoption("--preserve-db"):
+        logger.info("Dropping test database tables...")
+        drop_db()
+
+@pytest.fixture(scope="session", autouse=True)
+def setup_test_database(request):
+    """
+    Set up the test database before the session starts, and tear it down after tests
+    unless --preserve-db is provided. xdist workers share one database that the
+    controller manages, so they skip this.
+    """
+    if hasattr(request.config, "workerinput"):
+        yield
+        return
+
+    _reset_database()
+
     yield  # Tests run after this
 
     if not request.config.getoption("--preserve-db"):
@@ -170,11 +202,11 @@ def find_available_port() -> int:
 @pytest.fixture(scope="session")
 def fastapi_server():
     """
-    Start a FastAPI test server in a subprocess. If the chosen port (default: 8000)
-    is already in use, find another available port. Wait until the server is up
-    before yielding its base URL.
+    Start a FastAPI test server in a subprocess. If the chosen port (default: 8000,
+    plus the worker index under xdist) is already in use, find another available
+    port. Wait until the server is up before yielding its base URL.
     """
-    base_port = 8000
+    base_port = 8000 + WORKER_INDEX
     server_url = f'http://127.0.0.1:{base_port}/'
 
     # Check if port is free; if not, pick an available port
@@ -193,13 +225,14 @@ def fastapi_server():
         cwd='.'  # ensure the working directory is set correctly
     )
 
-    # IMPORTANT: Use the /health endpoint for the check!
-    health_url = f"{server_url}health"
+    # /healthz answers with no body, so probing it costs nothing while the app boots
+    health_url = f"{server_url}healthz"
     if not wait_for_server(health_url, timeout=30):
+        process.terminate()
         stderr = process.stderr.read()
         logger.error(f"Server failed to start. Uvicorn error: {stderr}")
-        process.terminate()
-        raise ServerStartupError(f"Failed to start test server on {health_url}")
+        # Stop the whole run; otherwise every server-backed test fails on its own timeout
+        pytest.exit(f"Failed to start test server on {health_url}", returncode=2)
 
     logger.info(f"Test server running on {server_url}.")
     yield server_url
@@ -213,16 +246,43 @@ def fastapi_server():
         process.kill()
         logger.warning("Test server forcefully stopped.")
 
+@pytest.fixture(scope="session")
+def registered_user(fastapi_server: str) -> Dict[str, str]:
+    """
+    Register one user through the API and share it across the UI login tests,
+    so each test doesn't drive the registration form first.
+    """
+    user_data = create_fake_user()
+    user_data["password"] = user_data["confirm_password"] = "SecurePass123!"
+    response = requests.post(f"{fastapi_server}auth/register", json=user_data)
+    assert response.status_code == 201, f"Registration failed: {response.text}"
+    return user_data
+
 # ======================================================================================
 # Playwright Fixtures for UI Testing
 # ======================================================================================
+# Fail fast on missing elements; the server answers in well under a second.
+# Navigation keeps more headroom so a cold first page load isn't penalized.
+UI_ACTION_TIMEOUT_MS = 5000
+UI_NAVIGATION_TIMEOUT_MS = 10000
+
+def _set_ui_timeouts(page: Page) -> None:
+    """Apply the suite's default action and navigation timeouts to a page."""
+    page.set_default_timeout(UI_ACTION_TIMEOUT_MS)
+    page.set_default_navigation_timeout(UI_NAVIGATION_TIMEOUT_MS)
+
 @pytest.fixture(scope="session")
 def browser_context():
     """Provide a Playwright browser context for UI tests (session-scoped)."""
     with sync_playwright() as playwright:
         browser = playwright.chromium.launch(
             headless=True,
-            args=['--no-sandbox', '--disable-dev-shm-usage']
+            args=[
+                '--no-sandbox', '--disable-dev-shm-usage',
+                # Form tests need none of these; skipping them trims startup and page loads
+                '--disable-gpu', '--disable-extensions', '--disable-background-networking',
+                '--disable-default-apps', '--disable-sync', '--blink-settings=imagesEnabled=false'
+            ]
         )
         logger.info("Playwright browser launched.")
         try:
@@ -231,15 +291,16 @@ def browser_context():
             logger.info("Closing Playwright browser.")
             browser.close()
 
-@pytest.fixture
-def page(browser_context: Browser):
+@pytest.fixture(scope="module")
+def shared_page(browser_context: Browser):
     """
-    Provide a new browser page for each test, with a standard viewport.
-    Closes the page and context after each test.
+    Provide one browser context and page per test module, with a standard viewport.
+    Closes the page and context once the module's tests are done.
     """
     context = browser_context.new_context(
         viewport={'width': 1920, 'height': 1080},
-        ignore_https_errors=True
+        ignore_https_errors=True,
+        service_workers='block'  # The app registers none
     )
     page = context.new_page()
     logger.info("New browser page created.")
@@ -250,6 +311,68 @@ def page(browser_context: Browser):
         page.close()
         context.close()
 
+@pytest.fixture
+def page(shared_page: Page):
+    """
+    Hand each test the module's page with cookies and web storage cleared,
+    which isolates tests without paying for a new browser context each time.
+    """
+    shared_page.context.clear_cookies()
+    if shared_page.url.startswith("http"):
+        # Storage is per origin and every test talks to the same server
+        shared_page.evaluate("() => { localStorage.clear(); sessionStorage.clear(); }")
+    # Reset here too, since a previous test may have tightened them on the shared page
+    _set_ui_timeouts(shared_page)
+    return shared_page
+
+@pytest.fixture(scope="session")
+def auth_state(browser_context: Browser, fastapi_server: str, registered_user: Dict[str, str]) -> Dict:
+    """
+    Log the registered user in once and capture the browser storage state,
+    so authenticated UI tests start logged in instead of running a login flow.
+    """
+    response = requests.post(
+        f"{fastapi_server}auth/login",
+        json={"username": registered_user["username"], "password": registered_user["password"]}
+    )
+    assert response.status_code == 200, f"Login failed: {response.text}"
+    tokens = response.json()
+
+    context = browser_context.new_context(service_workers='block')
+    try:
+        page = context.new_page()
+        page.goto(fastapi_server)
+        # Same keys login.html writes after a real login
+        page.evaluate(
+            """(t) => {
+                localStorage.setItem('token', t.access_token);
+                localStorage.setItem('refresh_token', t.refresh_token);
+                localStorage.setItem('user_id', t.user_id);
+                localStorage.setItem('username', t.username);
+            }""",
+            tokens
+        )
+        return context.storage_state()
+    finally:
+        context.close()
+
+@pytest.fixture
+def authed_page(browser_context: Browser, auth_state: Dict) -> Generator[Page, None, None]:
+    """Provide a page in a fresh context that starts with the registered user logged in."""
+    context = browser_context.new_context(
+        viewport={'width': 1920, 'height': 1080},
+        ignore_https_errors=True,
+        service_workers='block',
+        storage_state=auth_state
+    )
+    page = context.new_page()
+    _set_ui_timeouts(page)
+    try:
+        yield page
+    finally:
+        page.close()
+        context.close()
+
 # ======================================================================================
 # Pytest Command-Line Options
 # ======================================================================================
@@ -0,0 +1,9 @@
+"""
+Keywords expected in each kind of error message, compiled once and shared by
+the API-level and browser-level e2e tests.
+"""
+import re
+
+WEAK_PASSWORD_RE = re.compile(r"password|character|uppercase|lowercase|number", re.I)
+DUPLICATE_USER_RE = re.compile(r"username|exist|already|taken", re.I)
+INVALID_CRED_RE = re.compile(r"invalid|incorrect|failed", re.I)
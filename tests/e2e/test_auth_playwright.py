@@ -2,22 +2,34 @@
 Playwright E2E tests for authentication flows (registration and login).
 Tests both positive and negative scenarios including localStorage JWT verification.
 """
+import os
+import uuid
+
 import pytest
+import requests
 from playwright.sync_api import Page, expect
 from faker import Faker
 
+from tests.e2e.error_patterns import DUPLICATE_USER_RE, INVALID_CRED_RE, WEAK_PASSWORD_RE
+
 fake = Faker()
-Faker.seed(54321)  # Different seed from conftest to avoid conflicts
+# Different seed from conftest to avoid conflicts, offset per xdist worker
+Faker.seed(54321 + int(os.environ.get("PYTEST_XDIST_WORKER", "gw0")[2:]))
 
 
 # ======================================================================================
 # Helper Functions
 # ======================================================================================
-def generate_test_user():
+# Per-worker prefix so parallel workers (and leftover rows) never collide
+_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+
+
+def _make_test_user():
     """Generate unique test user data."""
+    prefix = f"{_WORKER}_{uuid.uuid4().hex[:8]}_"
     return {
-        "username": fake.unique.user_name(),
-        "email": fake.unique.email(),
+        "username": prefix + fake.unique.user_name(),
+        "email": prefix + fake.unique.email(),
         "first_name": fake.first_name(),
         "last_name": fake.last_name(),
         "password": "SecurePass123!",
@@ -25,6 +37,54 @@ def generate_test_user():
     }
 
 
+# Users are drawn up front so the tests themselves don't hit Faker's unique tracking
+_USER_POOL = [_make_test_user() for _ in range(32)]
+
+
+def generate_test_user():
+    """Take a unique test user from the pool, generating more if it runs dry."""
+    return _USER_POOL.pop() if _USER_POOL else _make_test_user()
+
+
+def register_via_api(base_url: str, user_data: dict):
+    """Create user_data's account directly through the API, for tests that only need it to exist."""
+    response = requests.post(f"{base_url}auth/register", json=user_data)
+    assert response.status_code == 201, f"Registration failed: {response.text}"
+
+
+def fill_register_form(page: Page, values: dict):
+    """Set every registration field in one browser round-trip; keys are input ids."""
+    page.evaluate("""(values) => {
+        for (const [id, value] of Object.entries(values)) {
+            const el = document.getElementById(id);
+            el.value = value;
+            el.dispatchEvent(new Event('input', { bubbles: true }));
+            el.dispatchEvent(new Event('change', { bubbles: true }));
+        }
+    }""", values)
+
+
+def submit_login_form(page: Page, base_url: str, user_data: dict):
+    """
+    Fill in and submit the login form; callers wait for the outcome they expect.
+    The form only has an email field and checks its format before sending anything.
+    """
+    page.goto(f"{base_url}login")
+    page.fill("#email", user_data["email"])
+    page.fill("#password", user_data["password"])
+    page.click('button[type="submit"]')
+
+
+def wait_for_alert(page: Page):
+    """Wait until the form shows its success or error alert."""
+    expect(page.locator("#successAlert:not(.hidden), #errorAlert:not(.hidden)")).to_be_visible()
+
+
+def wait_for_stored_login(page: Page):
+    """Wait until the login page has written its tokens; username is stored last."""
+    page.wait_for_function("() => localStorage.getItem('username') !== null")
+
+
 def clear_local_storage(page: Page):
     """Clear browser localStorage."""
     page.evaluate("() => localStorage.clear()")
@@ -35,6 +95,14 @@ def get_local_storage_item(page: Page, key: str):
     return page.evaluate(f"() => localStorage.getItem('{key}')")
 
 
+def get_local_storage_items(page: Page, *keys: str) -> dict:
+    """Get several localStorage items in one browser round-trip."""
+    return page.evaluate(
+        "(keys) => Object.fromEntries(keys.map((k) => [k, localStorage.getItem(k)]))",
+        list(keys)
+    )
+
+
 # ======================================================================================
 # Registration Tests - Positive Scenarios
 # ======================================================================================
@@ -54,20 +122,13 @@ def test_registration_success_positive(page: Page, fastapi_server: str):
     user_data = generate_test_user()
     
     # Fill in registration form
-    page.fill("#username", user_data["username"])
-    page.fill("#email", user_data["email"])
-    page.fill("#first_name", user_data["first_name"])
-    page.fill("#last_name", user_data["last_name"])
-    page.fill("#password", user_data["password"])
-    page.fill("#confirm_password", user_data["confirm_password"])
+    fill_register_form(page, user_data)
     
     # Submit form
     page.click('button[type="submit"]')
     
-    # Wait for success message or redirect
-    # The actual behavior depends on your implementation
-    # Adjust timeout and expectations based on your app's behavior
-    page.wait_for_timeout(2000)
+    # Wait for the form to report the outcome
+    wait_for_alert(page)
     
     # Check for success indicator (either success message or redirect to login)
     # This will vary based on your implementation
@@ -88,15 +149,10 @@ def test_registration_with_optional_confirm_password(page: Page, fastapi_server:
     
     user_data = generate_test_user()
     
-    page.fill("#username", user_data["username"])
-    page.fill("#email", user_data["email"])
-    page.fill("#first_name", user_data["first_name"])
-    page.fill("#last_name", user_data["last_name"])
-    page.fill("#password", user_data["password"])
-    page.fill("#confirm_password", user_data["password"])
+    fill_register_form(page, {**user_data, "confirm_password": user_data["password"]})
     
     page.click('button[type="submit"]')
-    page.wait_for_timeout(2000)
+    wait_for_alert(page)
     
     # Should not show error
     error_alert = page.locator("#errorAlert")
@@ -115,15 +171,9 @@ def test_registration_password_mismatch_negative(page: Page, fastapi_server: str
     
     user_data = generate_test_user()
     
-    page.fill("#username", user_data["username"])
-    page.fill("#email", user_data["email"])
-    page.fill("#first_name", user_data["first_name"])
-    page.fill("#last_name", user_data["last_name"])
-    page.fill("#password", "SecurePass123!")
-    page.fill("#confirm_password", "DifferentPass123!")
+    fill_register_form(page, {**user_data, "password": "SecurePass123!", "confirm_password": "DifferentPass123!"})
     
     page.click('button[type="submit"]')
-    page.wait_for_timeout(1000)
     
     # Should show error message
     error_alert = page.locator("#errorAlert")
@@ -140,22 +190,16 @@ def test_registration_weak_password_negative(page: Page, fastapi_server: str):
     
     user_data = generate_test_user()
     
-    page.fill("#username", user_data["username"])
-    page.fill("#email", user_data["email"])
-    page.fill("#first_name", user_data["first_name"])
-    page.fill("#last_name", user_data["last_name"])
-    page.fill("#password", "weak")
-    page.fill("#confirm_password", "weak")
+    fill_register_form(page, {**user_data, "password": "weak", "confirm_password": "weak"})
     
     page.click('button[type="submit"]')
-    page.wait_for_timeout(1000)
     
     # Should show error about password requirements
     error_alert = page.locator("#errorAlert")
     expect(error_alert).to_be_visible()
     
     error_message = page.locator("#errorMessage").inner_text()
-    assert any(word in error_message.lower() for word in ["password", "character", "uppercase", "lowercase", "number"]), \
+    assert WEAK_PASSWORD_RE.search(error_message), \
         "Should show password strength error"
 
 
@@ -166,15 +210,9 @@ def test_registration_invalid_email_negative(page: Page, fastapi_server: str):
     
     user_data = generate_test_user()
     
-    page.fill("#username", user_data["username"])
-    page.fill("#email", "not-a-valid-email")
-    page.fill("#first_name", user_data["first_name"])
-    page.fill("#last_name", user_data["last_name"])
-    page.fill("#password", user_data["password"])
-    page.fill("#confirm_password", user_data["confirm_password"])
+    fill_register_form(page, {**user_data, "email": "not-a-valid-email"})
     
     page.click('button[type="submit"]')
-    page.wait_for_timeout(1000)
     
     # Should show error about email format
     error_alert = page.locator("#errorAlert")
@@ -187,40 +225,30 @@ def test_registration_invalid_email_negative(page: Page, fastapi_server: str):
 @pytest.mark.e2e
 def test_registration_duplicate_username_negative(page: Page, fastapi_server: str):
     """Test registration fails when username already exists."""
-    page.goto(f"{fastapi_server}register")
-    
     # First registration
     user_data = generate_test_user()
-    
-    page.fill("#username", user_data["username"])
-    page.fill("#email", user_data["email"])
-    page.fill("#first_name", user_data["first_name"])
-    page.fill("#last_name", user_data["last_name"])
-    page.fill("#password", user_data["password"])
-    page.fill("#confirm_password", user_data["confirm_password"])
-    
-    page.click('button[type="submit"]')
-    page.wait_for_timeout(2000)
+    register_via_api(fastapi_server, user_data)
     
     # Try to register again with same username but different email
     page.goto(f"{fastapi_server}register")
     
-    page.fill("#username", user_data["username"])  # Same username
-    page.fill("#email", fake.unique.email())  # Different email
-    page.fill("#first_name", fake.first_name())
-    page.fill("#last_name", fake.last_name())
-    page.fill("#password", "AnotherPass123!")
-    page.fill("#confirm_password", "AnotherPass123!")
+    fill_register_form(page, {
+        "username": user_data["username"],  # Same username
+        "email": fake.unique.email(),  # Different email
+        "first_name": fake.first_name(),
+        "last_name": fake.last_name(),
+        "password": "AnotherPass123!",
+        "confirm_password": "AnotherPass123!"
+    })
     
     page.click('button[type="submit"]')
-    page.wait_for_timeout(1000)
     
     # Should show error about duplicate username
     error_alert = page.locator("#errorAlert")
     expect(error_alert).to_be_visible()
     
     error_message = page.locator("#errorMessage").inner_text()
-    assert any(word in error_message.lower() for word in ["username", "exist", "already", "taken"]), \
+    assert DUPLICATE_USER_RE.search(error_message), \
         "Should show duplicate username error"
 
 
@@ -233,10 +261,9 @@ def test_registration_missing_required_fields_negative(page: Page, fastapi_serve
     page.fill("#username", "testuser")
     
     page.click('button[type="submit"]')
-    page.wait_for_timeout(500)
+    expect(page.locator("#errorAlert")).to_be_visible()
     
-    # HTML5 validation should prevent submission or show error
-    # Check if still on registration page
+    # Client-side validation should reject the form without leaving the page
     assert "register" in page.url, "Should remain on registration page with missing fields"
 
 
@@ -244,36 +271,16 @@ def test_registration_missing_required_fields_negative(page: Page, fastapi_serve
 # Login Tests - Positive Scenarios
 # ======================================================================================
 @pytest.mark.e2e
-def test_login_success_positive(page: Page, fastapi_server: str):
+def test_login_success_positive(page: Page, fastapi_server: str, registered_user: dict):
     """
     Test successful login with valid credentials.
     Verifies JWT token storage in localStorage and redirect to dashboard.
     """
-    # First, register a user
-    page.goto(f"{fastapi_server}register")
-    user_data = generate_test_user()
-    
-    page.fill("#username", user_data["username"])
-    page.fill("#email", user_data["email"])
-    page.fill("#first_name", user_data["first_name"])
-    page.fill("#last_name", user_data["last_name"])
-    page.fill("#password", user_data["password"])
-    page.fill("#confirm_password", user_data["confirm_password"])
-    page.click('button[type="submit"]')
-    page.wait_for_timeout(2000)
+    user_data = registered_user
     
-    # Clear any stored tokens
-    clear_local_storage(page)
-    
-    # Now login
-    page.goto(f"{fastapi_server}login")
-    expect(page.locator("h2")).to_contain_text("Welcome Back")
-    
-    page.fill("#username", user_data["username"])
-    page.fill("#password", user_data["password"])
-    
-    page.click('button[type="submit"]')
-    page.wait_for_timeout(2000)
+    submit_login_form(page, fastapi_server, user_data)
+    expect(page.locator("h2")).to_contain_text("Login")
+    page.wait_for_url("**/dashboard")
     
     # Should redirect to dashboard
     current_url = page.url
@@ -282,75 +289,43 @@ def test_login_success_positive(page: Page, fastapi_server: str):
 
 
 @pytest.mark.e2e
-def test_login_stores_jwt_in_localstorage_positive(page: Page, fastapi_server: str):
+def test_login_stores_jwt_in_localstorage_positive(page: Page, fastapi_server: str, registered_user: dict):
     """
     Test that successful login stores JWT tokens in localStorage.
-    Verifies access_token, refresh_token, user_id, and username are stored.
+    Verifies the keys login.html writes: token, refresh_token, user_id, and username.
     """
-    # Register a user
-    page.goto(f"{fastapi_server}register")
-    user_data = generate_test_user()
-    
-    page.fill("#username", user_data["username"])
-    page.fill("#email", user_data["email"])
-    page.fill("#first_name", user_data["first_name"])
-    page.fill("#last_name", user_data["last_name"])
-    page.fill("#password", user_data["password"])
-    page.fill("#confirm_password", user_data["confirm_password"])
-    page.click('button[type="submit"]')
-    page.wait_for_timeout(2000)
-    
-    # Clear localStorage
-    clear_local_storage(page)
+    user_data = registered_user
     
     # Login
-    page.goto(f"{fastapi_server}login")
-    page.fill("#username", user_data["username"])
-    page.fill("#password", user_data["password"])
-    page.click('button[type="submit"]')
-    page.wait_for_timeout(2000)
+    submit_login_form(page, fastapi_server, user_data)
+    wait_for_stored_login(page)
     
-    # Verify tokens are stored in localStorage
-    access_token = get_local_storage_item(page, "access_token")
-    refresh_token = get_local_storage_item(page, "refresh_token")
-    user_id = get_local_storage_item(page, "user_id")
-    username = get_local_storage_item(page, "username")
+    # Verify tokens are stored in localStorage (the access token is kept under 'token')
+    stored = get_local_storage_items(page, "token", "refresh_token", "user_id", "username")
+    access_token = stored["token"]
+    refresh_token = stored["refresh_token"]
+    user_id = stored["user_id"]
+    username = stored["username"]
     
-    assert access_token is not None, "access_token should be stored in localStorage"
+    assert access_token is not None, "token should be stored in localStorage"
     assert refresh_token is not None, "refresh_token should be stored in localStorage"
     assert user_id is not None, "user_id should be stored in localStorage"
     assert username == user_data["username"], "username should be stored correctly in localStorage"
     
     # Verify tokens are not empty
-    assert len(access_token) > 0, "access_token should not be empty"
+    assert len(access_token) > 0, "token should not be empty"
     assert len(refresh_token) > 0, "refresh_token should not be empty"
 
 
 @pytest.mark.e2e
-def test_login_redirects_to_dashboard_positive(page: Page, fastapi_server: str):
+def test_login_redirects_to_dashboard_positive(page: Page, fastapi_server: str, registered_user: dict):
     """Test that successful login redirects to dashboard page."""
-    # Register and login
-    page.goto(f"{fastapi_server}register")
-    user_data = generate_test_user()
+    user_data = registered_user
     
-    page.fill("#username", user_data["username"])
-    page.fill("#email", user_data["email"])
-    page.fill("#first_name", user_data["first_name"])
-    page.fill("#last_name", user_data["last_name"])
-    page.fill("#password", user_data["password"])
-    page.fill("#confirm_password", user_data["confirm_password"])
-    page.click('button[type="submit"]')
-    page.wait_for_timeout(2000)
+    submit_login_form(page, fastapi_server, user_data)
     
-    clear_local_storage(page)
-    
-    page.goto(f"{fastapi_server}login")
-    page.fill("#username", user_data["username"])
-    page.fill("#password", user_data["password"])
-    page.click('button[type="submit"]')
-    
-    # Wait for redirect
-    page.wait_for_timeout(3000)
+    # Wait for the redirect
+    page.wait_for_url("**/dashboard")
     
     # Verify redirected to dashboard
     current_url = page.url
@@ -361,97 +336,52 @@ def test_login_redirects_to_dashboard_positive(page: Page, fastapi_server: str):
 # Login Tests - Negative Scenarios
 # ======================================================================================
 @pytest.mark.e2e
-def test_login_invalid_credentials_negative(page: Page, fastapi_server: str):
-    """Test login fails with invalid credentials and shows error message."""
-    page.goto(f"{fastapi_server}login")
-    
-    page.fill("#username", "nonexistentuser")
-    page.fill("#password", "WrongPassword123!")
-    
-    page.click('button[type="submit"]')
-    page.wait_for_timeout(1000)
-    
-    # Should show error message
-    error_alert = page.locator("#errorAlert")
-    expect(error_alert).to_be_visible()
+def test_login_error_ui_binding(page: Page, fastapi_server: str):
+    """
+    Test the login page shows the server's rejection in #errorAlert.
+    The credential cases themselves are covered at the API level in
+    test_fastapi_calculator.py; this only checks the UI wiring.
+    """
+    # Email-shaped, or the form rejects it before any request is sent
+    email = f"nobody_{uuid.uuid4().hex[:8]}@example.com"
+    
+    # Gate on the login API call itself rather than waiting for the DOM to change
+    with page.expect_response(
+        lambda r: r.url.endswith("/auth/login") and r.request.method == "POST"
+    ) as response_info:
+        submit_login_form(page, fastapi_server, {"email": email, "password": "WrongPassword123!"})
+    response = response_info.value
+    assert response.request.post_data_json["username"] == email, \
+        "The awaited response should be for the submitted form"
+    assert response.status == 401, f"Expected 401, got {response.status}"
+    
+    # The response is in, so the error alert only has to render
+    expect(page.locator("#errorAlert")).to_be_visible(timeout=1000)
     
     error_message = page.locator("#errorMessage").inner_text()
-    assert any(word in error_message.lower() for word in ["invalid", "incorrect", "failed", "password", "username"]), \
-        "Should show invalid credentials error"
-    
-    # Should NOT store tokens
-    access_token = get_local_storage_item(page, "access_token")
-    assert access_token is None or access_token == "", "Should not store access_token on failed login"
-
-
-@pytest.mark.e2e
-def test_login_wrong_password_negative(page: Page, fastapi_server: str):
-    """Test login fails with correct username but wrong password."""
-    # Register a user
-    page.goto(f"{fastapi_server}register")
-    user_data = generate_test_user()
-    
-    page.fill("#username", user_data["username"])
-    page.fill("#email", user_data["email"])
-    page.fill("#first_name", user_data["first_name"])
-    page.fill("#last_name", user_data["last_name"])
-    page.fill("#password", user_data["password"])
-    page.fill("#confirm_password", user_data["confirm_password"])
-    page.click('button[type="submit"]')
-    page.wait_for_timeout(2000)
-    
-    clear_local_storage(page)
-    
-    # Try to login with wrong password
-    page.goto(f"{fastapi_server}login")
-    page.fill("#username", user_data["username"])
-    page.fill("#password", "WrongPassword123!")
-    
-    page.click('button[type="submit"]')
-    page.wait_for_timeout(1000)
-    
-    # Should show error
-    error_alert = page.locator("#errorAlert")
-    expect(error_alert).to_be_visible()
+    assert INVALID_CRED_RE.search(error_message), \
+        f"Should show the invalid credentials error, got: {error_message}"
     
     # Should NOT redirect
     assert "login" in page.url, "Should remain on login page"
     
     # Should NOT store tokens
-    access_token = get_local_storage_item(page, "access_token")
-    assert access_token is None or access_token == "", "Should not store tokens on failed login"
-
-
-@pytest.mark.e2e
-def test_login_nonexistent_user_negative(page: Page, fastapi_server: str):
-    """Test login fails for non-existent user."""
-    page.goto(f"{fastapi_server}login")
-    
-    page.fill("#username", "thisuserdoesnotexist123")
-    page.fill("#password", "SomePassword123!")
-    
-    page.click('button[type="submit"]')
-    page.wait_for_timeout(1000)
-    
-    # Should show error
-    error_alert = page.locator("#errorAlert")
-    expect(error_alert).to_be_visible()
-    
-    error_message = page.locator("#errorMessage").inner_text()
-    assert any(word in error_message.lower() for word in ["invalid", "not found", "failed"]), \
-        "Should show user not found error"
+    access_token = get_local_storage_item(page, "token")
+    assert access_token is None or access_token == "", "Should not store token on failed login"
 
 
 @pytest.mark.e2e
 def test_login_empty_fields_negative(page: Page, fastapi_server: str):
     """Test login fails with empty fields."""
+    # Rejected client-side with no network call, so the alert appears at once
+    page.set_default_timeout(1000)
     page.goto(f"{fastapi_server}login")
     
     # Try to submit empty form
     page.click('button[type="submit"]')
-    page.wait_for_timeout(500)
+    expect(page.locator("#errorAlert")).to_be_visible(timeout=1000)
     
-    # Should remain on login page (HTML5 validation)
+    # Client-side validation should reject the form without leaving the page
     assert "login" in page.url, "Should remain on login page with empty fields"
 
 
@@ -459,39 +389,27 @@ def test_login_empty_fields_negative(page: Page, fastapi_server: str):
 # Logout/Token Cleanup Tests
 # ======================================================================================
 @pytest.mark.e2e
-def test_logout_clears_tokens_positive(page: Page, fastapi_server: str):
+def test_logout_clears_tokens_positive(authed_page: Page, fastapi_server: str):
     """Test that logout clears tokens from localStorage (if logout feature exists)."""
-    # Register and login
-    page.goto(f"{fastapi_server}register")
-    user_data = generate_test_user()
-    
-    page.fill("#username", user_data["username"])
-    page.fill("#email", user_data["email"])
-    page.fill("#first_name", user_data["first_name"])
-    page.fill("#last_name", user_data["last_name"])
-    page.fill("#password", user_data["password"])
-    page.fill("#confirm_password", user_data["confirm_password"])
-    page.click('button[type="submit"]')
-    page.wait_for_timeout(2000)
-    
-    clear_local_storage(page)
-    
-    page.goto(f"{fastapi_server}login")
-    page.fill("#username", user_data["username"])
-    page.fill("#password", user_data["password"])
-    page.click('button[type="submit"]')
-    page.wait_for_timeout(2000)
+    # The context starts from the session's saved login, so only clearing is covered here
+    page = authed_page
+    # The dashboard sends pages without a token back to /login, so staying proves the seeded login
+    page.goto(f"{fastapi_server}dashboard")
+    expect(page.locator("#userWelcome")).to_contain_text("Welcome")
+    assert "dashboard" in page.url, f"Seeded login should open the dashboard, got {page.url}"
     
     # Verify tokens are stored
-    access_token = get_local_storage_item(page, "access_token")
-    assert access_token is not None and access_token != "", "Tokens should be stored after login"
+    stored = get_local_storage_items(page, "token", "refresh_token")
+    assert stored["token"], "token should be stored after login"
+    assert stored["refresh_token"], "refresh_token should be stored after login"
     
     # Clear localStorage (simulating logout)
     clear_local_storage(page)
     
     # Verify tokens are cleared
-    access_token = get_local_storage_item(page, "access_token")
-    refresh_token = get_local_storage_item(page, "refresh_token")
+    stored = get_local_storage_items(page, "token", "refresh_token")
+    access_token = stored["token"]
+    refresh_token = stored["refresh_token"]
     
-    assert access_token is None or access_token == "", "access_token should be cleared after logout"
+    assert access_token is None or access_token == "", "token should be cleared after logout"
     assert refresh_token is None or refresh_token == "", "refresh_token should be cleared after logout"
@@ -5,6 +5,7 @@ import requests
 
 # Import the Calculation model for direct model tests.
 from app.models.calculation import Calculation
+from tests.e2e.error_patterns import INVALID_CRED_RE
 
 # ---------------------------------------------------------------------------
 # Helper Fixtures and Functions
@@ -49,6 +50,11 @@ def test_health_endpoint(base_url: str):
     assert response.status_code == 200, f"Expected status code 200 but got {response.status_code}. Response: {response.text}"
     assert response.json() == {"status": "ok"}, "Unexpected response from /health."
 
+def test_healthz_endpoint(base_url: str):
+    response = requests.get(f"{base_url}/healthz")
+    assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
+    assert response.content == b"", "/healthz should not return a body"
+
 def test_user_registration(base_url: str):
     url = f"{base_url}/auth/register"
     payload = {
@@ -130,6 +136,55 @@ def test_user_login(base_url: str):
     assert current_time.tzinfo is not None, "current_time should be timezone-aware"
     assert expires_at > current_time, "Token expiration should be in the future"
 
+_DUPLICATE_EMAIL = f"dup.{uuid4()}@example.com"
+
+def _registration_payload() -> dict:
+    """Valid registration body with a unique email/username per call."""
+    suffix = uuid4().hex[:12]
+    return {
+        "first_name": "Reg",
+        "last_name": "Case",
+        "email": f"reg.{suffix}@example.com",
+        "username": f"reg_{suffix}",
+        "password": "SecurePass123!",
+        "confirm_password": "SecurePass123!"
+    }
+
+@pytest.mark.parametrize("override, expected", [
+    ({}, 201),
+    ({"email": _DUPLICATE_EMAIL}, 400),
+    ({"password": "weakpass123!", "confirm_password": "weakpass123!"}, 422),
+    ({"password": "WeakPassword!", "confirm_password": "WeakPassword!"}, 422),
+    ({"password": "Short1!", "confirm_password": "Short1!"}, 422),
+    ({"confirm_password": "DifferentPass123!"}, 422),
+    ({"email": "not-a-valid-email"}, 422),
+    ({"username": None}, 422),
+], ids=["valid", "duplicate-email", "no-uppercase", "no-digit", "too-short",
+        "mismatch", "invalid-email", "missing-username"])
+def test_user_registration_cases(base_url: str, override: dict, expected: int):
+    url = f"{base_url}/auth/register"
+    if override.get("email") == _DUPLICATE_EMAIL:
+        first = {**_registration_payload(), "email": _DUPLICATE_EMAIL}
+        assert requests.post(url, json=first).status_code == 201
+    payload = {k: v for k, v in {**_registration_payload(), **override}.items() if v is not None}
+    response = requests.post(url, json=payload)
+    assert response.status_code == expected, f"Expected {expected} but got {response.status_code}. Response: {response.text}"
+
+@pytest.mark.integration
+@pytest.mark.parametrize("username, password", [
+    ("nonexistentuser", "WrongPassword123!"),
+    # None stands for the session's registered user, so this is a wrong password
+    (None, "WrongPassword123!"),
+    ("thisuserdoesnotexist123", "SomePassword123!"),
+], ids=["invalid-credentials", "wrong-password", "nonexistent-user"])
+def test_user_login_rejected_cases(base_url: str, request, username, password):
+    if username is None:
+        username = request.getfixturevalue("registered_user")["username"]
+    response = requests.post(f"{base_url}/auth/login", json={"username": username, "password": password})
+    assert response.status_code == 401, f"Expected 401 but got {response.status_code}. Response: {response.text}"
+    detail = response.json().get("detail", "")
+    assert INVALID_CRED_RE.search(detail), f"Unexpected error detail: {detail}"
+
 # ---------------------------------------------------------------------------
 # Calculations Endpoints Integration Tests
 # ---------------------------------------------------------------------------
@@ -287,6 +342,109 @@ def test_list_get_update_delete_calculation(base_url: str):
     get_response_after_delete = requests.get(get_url, headers=headers)
     assert get_response_after_delete.status_code == 404, "Expected 404 after deletion"
 
+def test_list_calculations_pagination(base_url: str):
+    user_data = {
+        "first_name": "Calc",
+        "last_name": "Pager",
+        "email": f"calc.pager{uuid4()}@example.com",
+        "username": f"calc_pager_{uuid4()}",
+        "password": "SecurePass123!",
+        "confirm_password": "SecurePass123!"
+    }
+    token_data = register_and_login(base_url, user_data)
+    headers = {"Authorization": f"Bearer {token_data['access_token']}"}
+    url = f"{base_url}/calculations"
+    
+    calc_ids = []
+    for i in range(5):
+        response = requests.post(url, json={"type": "addition", "inputs": [i, 1]}, headers=headers)
+        assert response.status_code == 201, f"Calculation creation failed: {response.text}"
+        calc_ids.append(response.json()["id"])
+    newest_first = calc_ids[::-1]
+    
+    # Pages come back newest first, limit rows at a time, starting at skip
+    pages = []
+    for skip in (0, 2, 4):
+        response = requests.get(url, params={"skip": skip, "limit": 2}, headers=headers)
+        assert response.status_code == 200, f"List calculations failed: {response.text}"
+        pages.append([c["id"] for c in response.json()])
+    assert pages == [newest_first[0:2], newest_first[2:4], newest_first[4:]]
+    
+    response = requests.get(url, params={"skip": 5, "limit": 2}, headers=headers)
+    assert response.status_code == 200 and response.json() == []
+    
+    for params in ({"limit": 0}, {"limit": 501}, {"skip": -1}):
+        response = requests.get(url, params=params, headers=headers)
+        assert response.status_code == 422, f"Expected 422 for {params}, got {response.status_code}"
+
+def test_update_calculation_timestamps_match_get(base_url: str):
+    user_data = {
+        "first_name": "Calc",
+        "last_name": "Stamps",
+        "email": f"calc.stamps{uuid4()}@example.com",
+        "username": f"calc_stamps_{uuid4()}",
+        "password": "SecurePass123!",
+        "confirm_password": "SecurePass123!"
+    }
+    token_data = register_and_login(base_url, user_data)
+    headers = {"Authorization": f"Bearer {token_data['access_token']}"}
+    
+    create_response = requests.post(
+        f"{base_url}/calculations",
+        json={"type": "addition", "inputs": [1, 2]},
+        headers=headers
+    )
+    assert create_response.status_code == 201, f"Calculation creation failed: {create_response.text}"
+    calc_url = f"{base_url}/calculations/{create_response.json()['id']}"
+    
+    update_response = requests.put(calc_url, json={"inputs": [3, 4]}, headers=headers)
+    assert update_response.status_code == 200, f"Update calculation failed: {update_response.text}"
+    get_response = requests.get(calc_url, headers=headers)
+    assert get_response.status_code == 200, f"Get calculation failed: {get_response.text}"
+    
+    # The PUT response must describe the row exactly as a later GET reads it back
+    updated, fetched = update_response.json(), get_response.json()
+    for field in ("created_at", "updated_at"):
+        assert updated[field] == fetched[field], \
+            f"{field} differs between PUT ({updated[field]}) and GET ({fetched[field]})"
+    assert _parse_datetime(updated["updated_at"]) >= _parse_datetime(updated["created_at"])
+
+def test_calculations_batch_endpoint(fastapi_server: str):
+    base_url = fastapi_server.rstrip("/")
+    user_data = {
+        "first_name": "Calc",
+        "last_name": "Batch",
+        "email": f"calc.batch{uuid4()}@example.com",
+        "username": f"calc_batch_{uuid4()}",
+        "password": "SecurePass123!",
+        "confirm_password": "SecurePass123!"
+    }
+    token_data = register_and_login(base_url, user_data)
+    headers = {"Authorization": f"Bearer {token_data['access_token']}"}
+    
+    calc_ids = []
+    for inputs in ([1, 2], [3, 4]):
+        response = requests.post(
+            f"{base_url}/calculations",
+            json={"type": "addition", "inputs": inputs},
+            headers=headers
+        )
+        assert response.status_code == 201, f"Calculation creation failed: {response.text}"
+        calc_ids.append(response.json()["id"])
+    
+    # Unknown ids are skipped; results come back in the requested order
+    ids = [calc_ids[1], str(uuid4()), calc_ids[0]]
+    batch_response = requests.get(f"{base_url}/calculations/batch", params={"ids": ids}, headers=headers)
+    assert batch_response.status_code == 200, f"Batch get failed: {batch_response.text}"
+    assert [c["id"] for c in batch_response.json()] == [calc_ids[1], calc_ids[0]]
+    
+    bad_response = requests.get(f"{base_url}/calculations/batch", params={"ids": "not-a-uuid"}, headers=headers)
+    assert bad_response.status_code == 422
+    
+    too_many = [str(uuid4()) for _ in range(101)]
+    too_many_response = requests.get(f"{base_url}/calculations/batch", params={"ids": too_many}, headers=headers)
+    assert too_many_response.status_code == 422
+
 # ---------------------------------------------------------------------------
 # Direct Model Tests for Calculation Operations
 # ---------------------------------------------------------------------------
@@ -1,7 +1,9 @@
 import pytest
 from unittest.mock import patch
 from fastapi import HTTPException, status
-from app.auth.dependencies import get_current_user, get_current_active_user
+from app.auth.dependencies import (
+    CurrentUser, get_current_user, get_current_active_user, get_current_user_light
+)
 from app.schemas.user import UserResponse
 from app.models.user import User
 from uuid import uuid4
@@ -103,3 +105,38 @@ def test_get_current_active_user_inactive(mock_verify_token):
 
     assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
     assert exc_info.value.detail == "Inactive user"
+
+# Test get_current_user_light builds the user from token claims
+def test_get_current_user_light_from_claims():
+    with patch.object(User, 'verify_token_claims') as mock:
+        mock.return_value = {
+            "sub": sample_user_data["id"],
+            "username": "testuser",
+            "is_active": True,
+            "is_verified": True,
+        }
+        current_user = get_current_user_light(token="validtoken")
+
+    assert current_user == CurrentUser(
+        id=sample_user_data["id"], username="testuser", is_active=True, is_verified=True
+    )
+    mock.assert_called_once_with("validtoken")
+
+# Test get_current_user_light with invalid token
+def test_get_current_user_light_invalid_token():
+    with patch.object(User, 'verify_token_claims', return_value=None):
+        with pytest.raises(HTTPException) as exc_info:
+            get_current_user_light(token="invalidtoken")
+
+    assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+    assert exc_info.value.detail == "Could not validate credentials"
+
+# Test get_current_user_light rejects tokens issued to inactive users
+def test_get_current_user_light_inactive():
+    claims = {"sub": inactive_user_data["id"], "username": "inactiveuser", "is_active": False}
+    with patch.object(User, 'verify_token_claims', return_value=claims):
+        with pytest.raises(HTTPException) as exc_info:
+            get_current_user_light(token="validtoken")
+
+    assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
+    assert exc_info.value.detail == "Inactive user"
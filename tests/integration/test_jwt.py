@@ -0,0 +1,112 @@
+# tests/integration/test_jwt.py
+
+import base64
+import hashlib
+import hmac
+from datetime import datetime, timedelta, timezone
+
+import jwt
+import pytest
+from app.auth.jwt import _HEADER_B64, _fast_decode, _fast_encode
+
+KEY = b"test-secret-key-for-hs256-tokens"
+
+def _b64(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+def _signed(payload_segment: bytes, key: bytes = KEY) -> str:
+    """Build a token with our header and a valid signature over any payload segment"""
+    signing_input = _HEADER_B64 + b"." + payload_segment
+    signature = hmac.new(key, signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + _b64(signature)).decode("ascii")
+
+def _claims(**overrides) -> dict:
+    now = datetime.now(timezone.utc)
+    claims = {"sub": "user-1", "type": "access", "exp": now + timedelta(minutes=5), "iat": now}
+    claims.update(overrides)
+    return claims
+
+def test_fast_encode_matches_pyjwt():
+    """The fast path signs exactly the bytes jwt.encode would for ASCII claims"""
+    claims = _claims(username="johndoe", is_active=True, score=1.5, jti="abc123")
+    assert _fast_encode(dict(claims), KEY) == jwt.encode(dict(claims), KEY, algorithm="HS256")
+
+def test_fast_encode_non_ascii_round_trips():
+    """Non-ASCII text is written as UTF-8 rather than escaped, but decodes the same"""
+    token = _fast_encode(_claims(username="zoë"), KEY)
+    assert jwt.decode(token, KEY, algorithms=["HS256"])["username"] == "zoë"
+    assert _fast_decode(token, KEY)["username"] == "zoë"
+
+def test_fast_decode_round_trip():
+    token = jwt.encode(_claims(), KEY, algorithm="HS256")
+    payload = _fast_decode(token, KEY, require=("exp", "iat", "sub"))
+    assert payload == jwt.decode(token, KEY, algorithms=["HS256"])
+
+def test_fast_decode_rejects_tampered_payload():
+    token = _fast_encode(_claims(), KEY)
+    header, payload, signature = token.split(".")
+    forged = _b64(b'{"sub":"admin","type":"access"}').decode("ascii")
+    with pytest.raises(jwt.InvalidSignatureError):
+        _fast_decode(f"{header}.{forged}.{signature}", KEY)
+
+def test_fast_decode_rejects_wrong_key():
+    token = _fast_encode(_claims(), KEY)
+    with pytest.raises(jwt.InvalidSignatureError):
+        _fast_decode(token, b"some-other-key")
+
+def test_fast_decode_rejects_expired_token():
+    past = datetime.now(timezone.utc) - timedelta(minutes=10)
+    token = _fast_encode(_claims(exp=past + timedelta(minutes=5), iat=past), KEY)
+    with pytest.raises(jwt.ExpiredSignatureError):
+        _fast_decode(token, KEY)
+    # Refresh-style callers may skip the expiry check
+    assert _fast_decode(token, KEY, verify_exp=False)["sub"] == "user-1"
+
+@pytest.mark.parametrize("claim", ["iat", "nbf"])
+def test_fast_decode_rejects_future_token(claim):
+    """Like jwt.decode, a token issued or valid only in the future is immature"""
+    future = datetime.now(timezone.utc) + timedelta(minutes=5)
+    token = _fast_encode(_claims(**{claim: future}), KEY)
+    with pytest.raises(jwt.ImmatureSignatureError):
+        jwt.decode(token, KEY, algorithms=["HS256"])
+    with pytest.raises(jwt.ImmatureSignatureError):
+        _fast_decode(token, KEY)
+
+def test_fast_decode_missing_required_claim():
+    claims = _claims()
+    del claims["sub"]
+    token = _fast_encode(claims, KEY)
+    with pytest.raises(jwt.MissingRequiredClaimError) as exc_info:
+        _fast_decode(token, KEY, require=("exp", "iat", "sub"))
+    assert exc_info.value.claim == "sub"
+
+def test_fast_decode_falls_back_to_pyjwt_for_other_headers():
+    """Any header but the pre-encoded one is verified by jwt.decode"""
+    token = jwt.encode(_claims(), KEY, algorithm="HS256", headers={"kid": "k1"})
+    assert _fast_decode(token, KEY)["sub"] == "user-1"
+
+    other_alg = jwt.encode(_claims(), KEY, algorithm="HS512")
+    with pytest.raises(jwt.InvalidAlgorithmError):
+        _fast_decode(other_alg, KEY)
+
+    unsigned = jwt.encode(_claims(), None, algorithm="none")
+    with pytest.raises(jwt.InvalidTokenError):
+        _fast_decode(unsigned, KEY)
+
+def test_fast_decode_rejects_bad_padding():
+    """A validly signed payload segment that is not base64url raises DecodeError"""
+    with pytest.raises(jwt.DecodeError):
+        _fast_decode(_signed(b"abcde"), KEY)
+
+@pytest.mark.parametrize("payload", [b"not json", b"[1, 2, 3]", b'"a string"'])
+def test_fast_decode_rejects_non_json_object_payload(payload):
+    with pytest.raises(jwt.DecodeError):
+        _fast_decode(_signed(_b64(payload)), KEY)
+
+def test_fast_decode_rejects_non_numeric_time_claim():
+    with pytest.raises(jwt.DecodeError):
+        _fast_decode(_signed(_b64(b'{"sub":"user-1","exp":"soon"}')), KEY)
+
+def test_fast_decode_rejects_non_ascii_token():
+    with pytest.raises(jwt.DecodeError):
+        _fast_decode("é.é.é", KEY)
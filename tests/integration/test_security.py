@@ -0,0 +1,35 @@
+# tests/integration/test_security.py
+
+import bcrypt
+import pytest
+from app.auth.security import hash_password, needs_rehash
+from app.core.config import get_settings
+
+settings = get_settings()
+
+def test_needs_rehash_matching_rounds():
+    """A hash made with the configured rounds is left alone"""
+    assert needs_rehash(hash_password("TestPass123")) is False
+
+def test_needs_rehash_different_rounds():
+    """A hash made with another cost factor should be upgraded"""
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS + 1)
+    hashed = bcrypt.hashpw(b"TestPass123", salt).decode("ascii")
+    assert needs_rehash(hashed) is True
+
+def test_needs_rehash_other_bcrypt_ident():
+    """A $2a$ hash with the configured rounds is still upgraded to $2b$"""
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS, prefix=b"2a")
+    hashed = bcrypt.hashpw(b"TestPass123", salt).decode("ascii")
+    assert needs_rehash(hashed) is True
+
+@pytest.mark.parametrize("hashed", [
+    "",
+    "not-a-hash",
+    "$2b$xx$abcdefghijklmnopqrstuv",
+    "$argon2id$v=19$m=65536,t=3,p=4$c2FsdA$aGFzaA",
+])
+def test_needs_rehash_rejects_non_bcrypt(hashed):
+    """Malformed or non-bcrypt hashes raise instead of being silently rehashed"""
+    with pytest.raises(ValueError):
+        needs_rehash(hashed)
@@ -0,0 +1,42 @@
+import pytest
+from pydantic import ValidationError
+from app.schemas.user import UserCreate
+
+VALID_USER = {
+    "first_name": "John",
+    "last_name": "Doe",
+    "email": "john.doe@example.com",
+    "username": "johndoe",
+    "password": "SecurePass123!",
+    "confirm_password": "SecurePass123!",
+}
+
+
+def test_user_create_matching_passwords():
+    """Test UserCreate accepts matching password and confirm_password."""
+    user_create = UserCreate(**VALID_USER)
+    assert user_create.password == user_create.confirm_password
+
+
+def test_user_create_password_mismatch():
+    """Test UserCreate rejects a confirm_password that differs."""
+    data = {**VALID_USER, "confirm_password": "OtherPass123!"}
+    with pytest.raises(ValidationError, match="Passwords do not match"):
+        UserCreate(**data)
+
+
+def test_user_create_missing_password_reports_field():
+    """Test a missing password is reported on the field, not as a mismatch."""
+    data = {k: v for k, v in VALID_USER.items() if k != "password"}
+    with pytest.raises(ValidationError) as exc_info:
+        UserCreate(**data)
+    errors = exc_info.value.errors()
+    assert [(e["type"], e["loc"]) for e in errors] == [("missing", ("password",))]
+
+
+def test_user_create_non_string_confirm_reports_field():
+    """Test a non-string confirm_password fails field validation, not the match check."""
+    data = {**VALID_USER, "confirm_password": 12345678}
+    with pytest.raises(ValidationError) as exc_info:
+        UserCreate(**data)
+    assert [e["loc"] for e in exc_info.value.errors()] == [("confirm_password",)]